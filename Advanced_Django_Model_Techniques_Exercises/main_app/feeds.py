@@ -0,0 +1,90 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.apps import apps
+from django.db import connections, models, router
+from django.db.models import Q, Value
+
+
+FEED_MODELS = ('Book', 'Movie', 'Music')
+FEED_FIELDS = ('id', 'title', 'description', 'genre', 'created_at', 'media_type')
+FEED_ORDERING = ('-created_at', 'title', 'media_type', 'id')
+
+
+@dataclass
+class MediaPage:
+    results: list[dict]
+    next_cursor: str | None
+
+
+def encode_media_cursor(created_at: datetime, title: str, media_type: str, pk: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([created_at.isoformat(), title, media_type, pk]).encode()).decode()
+
+
+def decode_media_cursor(cursor: str) -> tuple[datetime, str, str, int]:
+    try:
+        created_at, title, media_type, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), str(title), str(media_type), int(pk)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid media cursor: {cursor!r}") from e
+
+
+def _after(media_type: str, cursor: tuple[datetime, str, str, int]) -> Q:
+    # Rows following the cursor in FEED_ORDERING. media_type is constant within
+    # a branch, so its place in the key turns into a choice between > and >=
+    # on title, and each branch keeps a plain range on its own feed index.
+    created_at, title, cursor_type, pk = cursor
+    same_instant = Q(created_at=created_at)
+
+    if media_type > cursor_type:
+        same_instant &= Q(title__gte=title)
+    elif media_type < cursor_type:
+        same_instant &= Q(title__gt=title)
+    else:
+        same_instant &= Q(title__gt=title) | Q(title=title, pk__gt=pk)
+
+    return Q(created_at__lt=created_at) | same_instant
+
+
+def _branch(model_name: str, cursor, limit: int | None):
+    model = apps.get_model('main_app', model_name)
+    media_type = model._meta.model_name
+    queryset = model.objects.annotate(
+        media_type=Value(media_type, output_field=models.CharField()),
+    ).values(*FEED_FIELDS)
+
+    if cursor is not None:
+        queryset = queryset.filter(_after(media_type, cursor))
+
+    if limit is None or not connections[router.db_for_read(model)].features.supports_slicing_ordering_in_compound:
+        return queryset.order_by()
+
+    # Each branch stops at the page size, so no table is sorted in full.
+    return queryset.order_by(*FEED_ORDERING)[:limit]
+
+
+def media_feed(cursor: str = None, page_size: int = 20, ordered: bool = True):
+    # Latest Books, Movies and Music in one UNION ALL, as dicts with a
+    # media_type discriminator. Pages continue after the last
+    # (created_at, title, media_type, id) seen. ordered=False skips every
+    # ORDER BY and returns the whole unordered union as a queryset instead.
+    if not ordered:
+        if cursor is not None:
+            raise ValueError('A cursor can only be used with the ordered feed.')
+
+        first, *rest = (_branch(model_name, None, None) for model_name in FEED_MODELS)
+        return first.union(*rest, all=True)
+
+    decoded = decode_media_cursor(cursor) if cursor is not None else None
+    first, *rest = (_branch(model_name, decoded, page_size + 1) for model_name in FEED_MODELS)
+    results = list(first.union(*rest, all=True).order_by(*FEED_ORDERING)[:page_size + 1])
+    next_cursor = None
+
+    if len(results) > page_size:
+        results = results[:page_size]
+        last = results[-1]
+        next_cursor = encode_media_cursor(last['created_at'], last['title'], last['media_type'], last['id'])
+
+    return MediaPage(results, next_cursor)
@@ -0,0 +1,112 @@
+import csv
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from time import perf_counter
+
+import django
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+
+CUSTOMER_CSV_COLUMNS = ('name', 'age', 'email', 'phone_number', 'website_url')
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    imported: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _setup_worker() -> None:
+    # Spawned workers start with an empty app registry; forked ones inherit it.
+    if not apps.ready:
+        django.setup()
+
+
+def validate_customer_rows(rows: list[tuple[int, dict]]) -> tuple[list[dict], list[tuple[int, dict, str]]]:
+    # Runs in a worker process. Returns the cleaned field values of the valid
+    # rows and (line, row, messages) for the rejected ones.
+    customer_model = apps.get_model('main_app', 'Customer')
+    valid, rejected = [], []
+
+    for line, row in rows:
+        customer = customer_model(**{column: row.get(column) or '' for column in CUSTOMER_CSV_COLUMNS})
+
+        try:
+            customer.clean_fields()
+        except ValidationError as e:
+            messages = '; '.join(
+                f'{field}: {message}' for field, field_messages in e.message_dict.items() for message in field_messages
+            )
+            rejected.append((line, row, messages))
+        else:
+            valid.append({column: getattr(customer, column) for column in CUSTOMER_CSV_COLUMNS})
+
+    return valid, rejected
+
+
+def import_customers(
+        file,
+        rejects_file,
+        workers: int = None,
+        chunk_size: int = 2000,
+        batch_size: int = 1000,
+) -> ImportReport:
+    # Streams the CSV in chunks and validates them in a process pool, keeping
+    # at most two chunks per worker in flight so memory stays flat however
+    # large the file is. Valid rows are bulk-inserted as their chunk comes
+    # back, in file order; rejects go to rejects_file with their messages.
+    # workers=0 validates in this process.
+    customer_model = apps.get_model('main_app', 'Customer')
+    reader = csv.DictReader(file)
+    rejects = csv.writer(rejects_file)
+    rejects.writerow(['line', *CUSTOMER_CSV_COLUMNS, 'errors'])
+
+    # Line 1 is the header.
+    numbered = enumerate(reader, start=2)
+    chunks = iter(lambda: list(islice(numbered, chunk_size)), [])
+    report = ImportReport()
+    start = perf_counter()
+
+    def store(valid, rejected):
+        with transaction.atomic():
+            customer_model.objects.bulk_create([customer_model(**row) for row in valid], batch_size=batch_size)
+
+        for line, row, messages in rejected:
+            rejects.writerow([line, *(row.get(column) for column in CUSTOMER_CSV_COLUMNS), messages])
+
+        report.rows += len(valid) + len(rejected)
+        report.imported += len(valid)
+        report.rejected += len(rejected)
+
+    if workers == 0:
+        for chunk in chunks:
+            store(*validate_customer_rows(chunk))
+    else:
+        workers = workers or os.cpu_count()
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_setup_worker) as pool:
+            pending = deque()
+
+            for chunk in chunks:
+                pending.append(pool.submit(validate_customer_rows, chunk))
+
+                if len(pending) >= 2 * workers:
+                    store(*pending.popleft().result())
+
+            while pending:
+                store(*pending.popleft().result())
+
+    report.seconds = perf_counter() - start
+
+    return report
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from main_app.importers import import_customers
+
+
+class Command(BaseCommand):
+    help = 'Streams customers from a CSV file, validating rows in parallel.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--rejects', help='Where rejected rows are written. Defaults to <path>.rejects.csv.')
+        parser.add_argument('--workers', type=int, help='Validation processes, 0 to validate in this process.')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rejects_path = options['rejects'] or f"{options['path']}.rejects.csv"
+
+        with open(options['path'], newline='', encoding='utf-8') as file, \
+                open(rejects_path, 'w', newline='', encoding='utf-8') as rejects_file:
+            report = import_customers(
+                file,
+                rejects_file,
+                workers=options['workers'],
+                chunk_size=options['chunk_size'],
+                batch_size=options['batch_size'],
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Read {report.rows} rows, imported {report.imported} customers and rejected {report.rejected} "
+            f"in {report.seconds:.2f}s ({report.rows_per_second:.0f} rows/s)."
+        ))
+
+        if report.rejected:
+            self.stdout.write(f"Rejected rows written to {rejects_path}.")
@@ -0,0 +1,46 @@
+from django.db import models
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Greatest, Least
+
+
+class HeroQuerySet(models.QuerySet):
+    def recharge_all(self, amount: int) -> int:
+        # One UPDATE for every hero in the queryset, clamped in the database so
+        # concurrent ticks never overwrite each other.
+        return self.update(energy=Least(
+            F('energy') + amount, Value(self.model.MAX_ENERGY), output_field=models.PositiveIntegerField()
+        ))
+
+
+    def use_abilities(self, hero_ids) -> int:
+        # hero_ids is either ids of heroes of this queryset's class, or a
+        # {hero class: ids} mapping to use several proxy classes' abilities at
+        # once. Heroes without enough energy are left as they are, like
+        # Hero.use_ability(). Returns how many heroes used their ability.
+        if not isinstance(hero_ids, dict):
+            hero_ids = {self.model: hero_ids}
+
+        hero_ids = {hero_class: set(ids) for hero_class, ids in hero_ids.items()}
+        seen = set()
+
+        for ids in hero_ids.values():
+            if seen & ids:
+                raise ValueError(f"Heroes {sorted(seen & ids)} are listed under more than one hero class.")
+
+            seen |= ids
+
+        if not seen:
+            return 0
+
+        able = Q()
+        energy = []
+
+        for hero_class, ids in hero_ids.items():
+            able |= Q(pk__in=ids, energy__gte=hero_class.ABILITY_ENERGY_REQUIRED)
+            energy.append(When(pk__in=ids, then=Greatest(
+                F('energy') - Value(hero_class.ABILITY_ENERGY_REQUIRED),
+                Value(hero_class.MIN_ENERGY),
+                output_field=models.PositiveIntegerField(),
+            )))
+
+        return self.filter(able).update(energy=Case(*energy, default=F('energy')))
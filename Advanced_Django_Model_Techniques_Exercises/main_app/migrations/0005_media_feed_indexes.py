@@ -0,0 +1,25 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0004_hero_flashhero_spiderhero'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['-created_at', 'title', 'id'], name='main_app_book_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['-created_at', 'title', 'id'], name='main_app_movie_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='music',
+            index=models.Index(fields=['-created_at', 'title', 'id'], name='main_app_music_feed_idx'),
+        ),
+    ]
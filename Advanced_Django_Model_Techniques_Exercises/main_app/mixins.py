@@ -1,10 +1,19 @@
+from django.db.models import F, PositiveIntegerField, Value
+from django.db.models.functions import Least
+
+
 class RechargeEnergyMixin:
     MAX_ENERGY: int = 100
 
 
     def recharge_energy(self, amount: int) -> None:
-        self.energy += amount
-        if self.energy > self.MAX_ENERGY:
-            self.energy = self.MAX_ENERGY
+        if self.pk is None:
+            # Not stored yet, so there is no row to update; save() inserts it.
+            self.energy = min(self.energy + amount, self.MAX_ENERGY)
+            self.save()
+            return
 
-        self.save()
\ No newline at end of file
+        type(self)._default_manager.filter(pk=self.pk).update(
+            energy=Least(F('energy') + amount, Value(self.MAX_ENERGY), output_field=PositiveIntegerField())
+        )
+        self.refresh_from_db(fields=['energy'])
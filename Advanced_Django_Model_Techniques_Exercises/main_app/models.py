@@ -1,6 +1,7 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MinLengthValidator
 
+from main_app.managers import HeroQuerySet
 from main_app.validators import NameValidator, PhoneValidator
 from decimal import Decimal
 from main_app.mixins import RechargeEnergyMixin
@@ -34,6 +35,10 @@ class BaseMedia(models.Model):
     class Meta:
         abstract = True
         ordering = ['-created_at', 'title']
+        indexes = [
+            # Backs the inherited ordering and the keyset in main_app.feeds.
+            models.Index(fields=['-created_at', 'title', 'id'], name='%(app_label)s_%(class)s_feed_idx'),
+        ]
 
     title = models.CharField(max_length=100)
     description = models.TextField()
@@ -136,6 +141,8 @@ class Hero(models.Model, RechargeEnergyMixin):
     hero_title = models.CharField(max_length=100)
     energy = models.PositiveIntegerField()
 
+    objects = HeroQuerySet.as_manager()
+
 
     @property
     def required_energy_message(self) -> str:
@@ -148,13 +155,19 @@ class Hero(models.Model, RechargeEnergyMixin):
 
 
     def use_ability(self):
-        if self.energy < self.ABILITY_ENERGY_REQUIRED:
-            return self.required_energy_message
+        if self.pk is None:
+            # Nothing stored to update yet, the energy only changes in memory.
+            if self.energy < self.ABILITY_ENERGY_REQUIRED:
+                return self.required_energy_message
 
-        if self.energy - self.ABILITY_ENERGY_REQUIRED > 0:
-            self.energy -= self.ABILITY_ENERGY_REQUIRED
-        else:
-            self.energy = self.MIN_ENERGY
+            self.energy = max(self.energy - self.ABILITY_ENERGY_REQUIRED, self.MIN_ENERGY)
+            return self.successful_ability_use_message
+
+        used = type(self).objects.use_abilities([self.pk])
+        self.refresh_from_db(fields=['energy'])
+
+        if not used:
+            return self.required_energy_message
 
         return self.successful_ability_use_message
 
@@ -0,0 +1,140 @@
+from django.core.exceptions import ValidationError
+from django.core.validators import (
+    MaxLengthValidator,
+    MaxValueValidator,
+    MinLengthValidator,
+    MinValueValidator,
+)
+
+from main_app.validators import RangeValidator
+
+
+class BulkValidationError(ValidationError):
+    def __init__(self, report: dict[int, dict[str, list[str]]]):
+        self.report = report
+        super().__init__(f'{len(report)} of the given rows are invalid.')
+
+
+def _limit(validator):
+    return validator.limit_value() if callable(validator.limit_value) else validator.limit_value
+
+
+def _bounds(validator):
+    # (low, high, by_length) for validators with a column-wise check, None for
+    # custom ones, which are called value by value.
+    if isinstance(validator, RangeValidator):
+        return validator.min_value, validator.max_value, False
+
+    if isinstance(validator, MinValueValidator):
+        return _limit(validator), None, False
+
+    if isinstance(validator, MaxValueValidator):
+        return None, _limit(validator), False
+
+    if isinstance(validator, MinLengthValidator):
+        return _limit(validator), None, True
+
+    if isinstance(validator, MaxLengthValidator):
+        return None, _limit(validator), True
+
+    return None
+
+
+def _out_of_bounds(values: list, low, high) -> list[int]:
+    # min()/max() settle a fully valid column in two C-level passes; only a
+    # column holding at least one bad value is scanned row by row.
+    if (low is None or low <= min(values)) and (high is None or max(values) <= high):
+        return []
+
+    return [
+        i for i, value in enumerate(values)
+        if (low is not None and value < low) or (high is not None and value > high)
+    ]
+
+
+def _add_error(report: dict, row: int, field_name: str, error: ValidationError) -> None:
+    report.setdefault(row, {}).setdefault(field_name, []).extend(error.messages)
+
+
+def _validate_column(field, rows: list[int], values: list, report: dict) -> list:
+    # Returns the column converted by field.to_python(), as clean_fields()
+    # would assign it; values that fail conversion are reported and skip
+    # the remaining checks, like they do in full_clean().
+    converted = list(values)
+    present = []
+
+    for i, value in enumerate(values):
+        if value in field.empty_values:
+            if value is None and not field.null:
+                _add_error(report, rows[i], field.name, ValidationError(field.error_messages['null']))
+            elif not field.blank:
+                _add_error(report, rows[i], field.name, ValidationError(field.error_messages['blank']))
+
+            continue
+
+        try:
+            converted[i] = field.to_python(value)
+        except ValidationError as e:
+            _add_error(report, rows[i], field.name, e)
+        else:
+            present.append(i)
+
+    if not present:
+        return converted
+
+    present_values = [converted[i] for i in present]
+
+    if field.choices:
+        allowed = {key for key, _ in field.flatchoices}
+
+        for i, value in zip(present, present_values):
+            if value not in allowed:
+                _add_error(report, rows[i], field.name, ValidationError(
+                    field.error_messages['invalid_choice'], params={'value': value}
+                ))
+
+    for validator in field.validators:
+        bounds = _bounds(validator)
+        candidates = range(len(present))
+
+        if bounds is not None:
+            low, high, by_length = bounds
+            candidates = _out_of_bounds(
+                list(map(len, present_values)) if by_length else present_values, low, high
+            )
+
+        # Only the candidates go through the validator itself, which also
+        # builds the exact message full_clean() would report.
+        for j in candidates:
+            try:
+                validator(present_values[j])
+            except ValidationError as e:
+                _add_error(report, rows[present[j]], field.name, e)
+
+    return converted
+
+
+def validate_bulk(model, objs, exclude=None, batch_size: int = 10000) -> dict[int, dict[str, list[str]]]:
+    # Converts and validates each concrete field column by column over batches
+    # of instances, leaving the converted values on them as full_clean() does.
+    # Returns {row index: {field name: [messages]}} for the invalid rows only,
+    # so an empty report means the whole input is valid.
+    objs = list(objs)
+    exclude = set(exclude or ())
+    fields = [
+        field for field in model._meta.concrete_fields
+        if not field.primary_key and not field.is_relation and not field.generated and field.name not in exclude
+    ]
+    report = {}
+
+    for start in range(0, len(objs), batch_size):
+        batch = objs[start:start + batch_size]
+        rows = list(range(start, start + len(batch)))
+
+        for field in fields:
+            converted = _validate_column(field, rows, [getattr(obj, field.attname) for obj in batch], report)
+
+            for obj, value in zip(batch, converted):
+                setattr(obj, field.attname, value)
+
+    return dict(sorted(report.items()))
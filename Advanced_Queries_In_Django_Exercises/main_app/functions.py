@@ -0,0 +1,24 @@
+from django.db import models
+
+
+class DaysBetween(models.Func):
+    # end - start on PostgreSQL (date - date is an integer number of days),
+    # julianday(end) - julianday(start) on SQLite. Both are deterministic, so
+    # the function can back a generated column.
+    output_field = models.IntegerField()
+    arity = 2
+
+    def __init__(self, end, start, **extra):
+        super().__init__(end, start, **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, template='(%(expressions)s)', arg_joiner=' - ', **extra_context)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler,
+            connection,
+            template='CAST(julianday(%(expressions)s) AS INTEGER)',
+            arg_joiner=') - julianday(',
+            **extra_context,
+        )
@@ -0,0 +1,47 @@
+from django.db.models import F
+
+from main_app.models import Programmer, Project, Technology
+
+
+def _cache_related(instance, name: str, objects: list) -> None:
+    # Leaves the same cache prefetch_related() would, so instance.<name>.all()
+    # returns the shared objects without another query.
+    queryset = getattr(instance, name).all()
+    queryset._result_cache = objects
+    queryset._prefetch_done = True
+
+    if not hasattr(instance, '_prefetched_objects_cache'):
+        instance._prefetched_objects_cache = {}
+
+    instance._prefetched_objects_cache[name] = queryset
+
+
+def load_programmers_graph(programmers) -> list[Programmer]:
+    # Programmers -> projects -> technologies in three queries (roots, projects,
+    # technologies) however many roots there are. Each Project and Technology
+    # row is built once and shared by every parent through an identity map.
+    programmers = list(programmers)
+    projects = {}
+    technologies = {}
+    projects_by_programmer = {programmer.pk: [] for programmer in programmers}
+    technologies_by_project = {}
+
+    for project in Project.objects.filter(
+            programmers__in=projects_by_programmer
+    ).annotate(programmer_ref=F('programmers')).order_by('id'):
+        projects_by_programmer[project.programmer_ref].append(projects.setdefault(project.pk, project))
+
+    for technology in Technology.objects.filter(
+            projects__in=projects
+    ).annotate(project_ref=F('projects')).order_by('id'):
+        technologies_by_project.setdefault(technology.project_ref, []).append(
+            technologies.setdefault(technology.pk, technology)
+        )
+
+    for project in projects.values():
+        _cache_related(project, 'technologies_used', technologies_by_project.get(project.pk, []))
+
+    for programmer in programmers:
+        _cache_related(programmer, 'projects', projects_by_programmer[programmer.pk])
+
+    return programmers
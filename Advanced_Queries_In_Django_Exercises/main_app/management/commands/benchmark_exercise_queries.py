@@ -0,0 +1,81 @@
+import random
+from itertools import islice
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from main_app.models import Exercise
+
+
+# Each classmethod with the arguments it is benchmarked with. The plans each
+# one is expected to use are checked in main_app.tests.
+ACCESS_PATHS = [
+    ('get_long_and_hard_exercises', ()),
+    ('get_short_and_easy_exercises', ()),
+    ('get_exercises_within_duration', (44, 46)),
+    ('get_exercises_with_difficulty_and_repetitions', (18, 45)),
+]
+
+
+class Command(BaseCommand):
+    help = 'Seeds exercises into a throwaway test database and times each range query without and with its indexes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--exercises', type=int, default=1_000_000)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        # Dropping the indexes is only safe on a database nobody else uses.
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+        try:
+            start = perf_counter()
+            self.seed(options['exercises'], options['batch_size'])
+            self.stdout.write(f"Seeded {options['exercises']} exercises in {perf_counter() - start:.1f}s.")
+
+            with connection.schema_editor() as schema_editor:
+                for index in Exercise._meta.indexes:
+                    schema_editor.remove_index(Exercise, index)
+
+            self.stdout.write('Without indexes:')
+            self.run_queries()
+
+            with connection.schema_editor() as schema_editor:
+                for index in Exercise._meta.indexes:
+                    schema_editor.add_index(Exercise, index)
+
+            self.stdout.write('With indexes:')
+            self.run_queries()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def run_queries(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Exercise._meta.db_table}')
+
+        for name, arguments in ACCESS_PATHS:
+            queryset = getattr(Exercise, name)(*arguments)
+            start = perf_counter()
+            rows = sum(1 for _ in queryset.iterator(chunk_size=10_000))
+            elapsed = perf_counter() - start
+
+            self.stdout.write(f"  {name}{arguments}: {rows} rows in {elapsed * 1000:.0f} ms\n{queryset.explain()}")
+
+    def seed(self, count, batch_size):
+        # Most exercises are moderate, so the long/hard and short/easy slices
+        # stay small, as they would in a real catalogue.
+        exercises = (
+            Exercise(
+                name=f'Bench Exercise {i}',
+                category=random.choice(['Strength', 'Cardio', 'Mobility', 'Balance']),
+                difficulty_level=round(random.triangular(1, 20, 6)),
+                duration_minutes=round(random.triangular(5, 90, 25)),
+                repetitions=random.randint(1, 50),
+            )
+            for i in range(count)
+        )
+
+        while batch := list(islice(exercises, batch_size)):
+            Exercise.objects.bulk_create(batch)
@@ -0,0 +1,83 @@
+import tracemalloc
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from main_app.loaders import load_programmers_graph
+from main_app.models import Programmer, Project, Technology
+
+
+class Command(BaseCommand):
+    help = 'Compares per-programmer prefetching with the batch graph loader.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--programmers', type=int, default=500)
+        parser.add_argument('--projects', type=int, default=50)
+        parser.add_argument('--technologies', type=int, default=30)
+        parser.add_argument('--per-programmer', type=int, default=5)
+        parser.add_argument('--per-project', type=int, default=4)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options)
+
+            roots = Programmer.objects.filter(name__startswith='Bench Programmer ').order_by('id')
+            self.measure('get_projects_with_technologies()', lambda: [
+                (project, list(project.technologies_used.all()))
+                for programmer in roots.all()
+                for project in programmer.get_projects_with_technologies()
+            ])
+            self.measure('load_programmers_graph()', lambda: [
+                (project, list(project.technologies_used.all()))
+                for programmer in load_programmers_graph(roots.all())
+                for project in programmer.projects.all()
+            ])
+
+            transaction.set_rollback(True)
+
+    def measure(self, name, render):
+        tracemalloc.start()
+        start = perf_counter()
+
+        with CaptureQueriesContext(connection) as queries:
+            rows = render()
+
+        elapsed = perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        distinct_projects = len({id(project) for project, _ in rows})
+        self.stdout.write(
+            f"{name}: {len(queries)} queries, {elapsed * 1000:.0f} ms, peak {peak / 1024:.0f} KiB, "
+            f"{distinct_projects} Project objects for {len(rows)} rendered rows"
+        )
+
+    def seed(self, options):
+        technologies = Technology.objects.bulk_create(
+            Technology(name=f'Bench Technology {i}', description='') for i in range(options['technologies'])
+        )
+        projects = Project.objects.bulk_create(
+            Project(name=f'Bench Project {i}', description='') for i in range(options['projects'])
+        )
+        programmers = Programmer.objects.bulk_create(
+            Programmer(name=f'Bench Programmer {i}') for i in range(options['programmers'])
+        )
+
+        Project.technologies_used.through.objects.bulk_create(
+            Project.technologies_used.through(
+                project_id=project.pk,
+                technology_id=technologies[(i + j) % len(technologies)].pk,
+            )
+            for i, project in enumerate(projects)
+            for j in range(options['per_project'])
+        )
+        Programmer.projects.through.objects.bulk_create(
+            Programmer.projects.through(
+                programmer_id=programmer.pk,
+                project_id=projects[(i + j) % len(projects)].pk,
+            )
+            for i, programmer in enumerate(programmers)
+            for j in range(options['per_programmer'])
+        )
@@ -0,0 +1,101 @@
+import datetime
+import random
+from itertools import islice
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import F
+
+from main_app.models import Task
+
+
+DAYS = 7
+
+# The classmethods as they were before duration_days, timed without the
+# partial indexes.
+BEFORE = [
+    ('ongoing_high_priority_tasks', lambda: Task.objects.filter(
+        priority='High', is_completed=False, completion_date__gt=F('creation_date')
+    )),
+    ('completed_mid_priority_tasks', lambda: Task.objects.filter(priority='Medium', is_completed=True)),
+    ('recent_completed_tasks', lambda: Task.objects.filter(
+        is_completed=True, completion_date__gte=F('creation_date') - datetime.timedelta(days=DAYS)
+    )),
+]
+
+# The current classmethods, timed with the partial indexes. The plans each one
+# is expected to use are checked in main_app.tests.
+AFTER = [
+    ('ongoing_high_priority_tasks', Task.ongoing_high_priority_tasks),
+    ('completed_mid_priority_tasks', Task.completed_mid_priority_tasks),
+    ('recent_completed_tasks', lambda: Task.recent_completed_tasks(DAYS)),
+]
+
+
+class Command(BaseCommand):
+    help = 'Seeds tasks into a throwaway test database and times the priority/status queries before and after the partial indexes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=1_000_000)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        # Dropping the indexes is only safe on a database nobody else uses.
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+        try:
+            start = perf_counter()
+            self.seed(options['tasks'], options['batch_size'])
+            self.stdout.write(f"Seeded {options['tasks']} tasks in {perf_counter() - start:.1f}s.")
+
+            with connection.schema_editor() as schema_editor:
+                for index in Task._meta.indexes:
+                    schema_editor.remove_index(Task, index)
+
+            self.stdout.write('Before:')
+
+            for name, queryset in BEFORE:
+                self.run_query(name, queryset())
+
+            with connection.schema_editor() as schema_editor:
+                for index in Task._meta.indexes:
+                    schema_editor.add_index(Task, index)
+
+            self.stdout.write('After:')
+
+            for name, queryset in AFTER:
+                self.run_query(name, queryset())
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def run_query(self, name, queryset):
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Task._meta.db_table}')
+
+        start = perf_counter()
+        rows = sum(1 for _ in queryset.iterator(chunk_size=10_000))
+        elapsed = perf_counter() - start
+
+        self.stdout.write(f"  {name}: {rows} rows in {elapsed * 1000:.0f} ms\n{queryset.explain()}")
+
+    def seed(self, count, batch_size):
+        # Most tasks are low priority, half are completed and completion dates
+        # spread from a year before creation to two months after it.
+        today = datetime.date.today()
+        priorities = [priority for priority, _ in Task.PRIORITIES]
+        tasks = (
+            Task(
+                title=f'Bench Task {i}',
+                description='',
+                priority=random.choices(priorities, weights=[60, 25, 15])[0],
+                is_completed=random.random() < 0.5,
+                creation_date=today,
+                completion_date=today + datetime.timedelta(days=random.randint(-365, 60)),
+            )
+            for i in range(count)
+        )
+
+        while batch := list(islice(tasks, batch_size)):
+            Task.objects.bulk_create(batch)
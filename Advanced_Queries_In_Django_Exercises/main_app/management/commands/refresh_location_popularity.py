@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from main_app.models import LocationPopularity, RealEstateListing
+
+
+class Command(BaseCommand):
+    help = 'Refreshes the popular locations snapshot, meant to be run on a schedule.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recount the LocationPopularity table from the listings first.',
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            locations = LocationPopularity.objects.rebuild()
+            self.stdout.write(f"Recounted listings for {locations} locations.")
+
+        snapshot = RealEstateListing.objects.refresh_popular_locations_snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f"Popular locations snapshot: {', '.join(row['location'] for row in snapshot) or 'empty'}."
+        ))
@@ -1,9 +1,102 @@
-from django.db import models
+import base64
+import json
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db import models, transaction
 from decimal import Decimal
-from django.db.models import Count, Avg
+from django.db.models import Case, Count, F, Max, Min, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from main_app.bulk_validation import BulkValidationError, validate_bulk
+
+
+# VideoGameRatingStats.genre of the row covering every game.
+ALL_GENRES = ''
+
+
+@dataclass
+class ListingPage:
+    results: list
+    next_cursor: str | None
+
+
+def encode_listing_cursor(price: Decimal, pk: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([str(price), pk]).encode()).decode()
+
+
+def decode_listing_cursor(cursor: str) -> tuple[Decimal, int]:
+    try:
+        price, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return Decimal(price), int(pk)
+    except (ValueError, TypeError, ArithmeticError) as e:
+        raise ValueError(f"Invalid listing cursor: {cursor!r}") from e
+
+
+class RealEstateListingQuerySet(models.QuerySet):
+    def _popularity(self):
+        return self.model._meta.apps.get_model('main_app', 'LocationPopularity').objects.db_manager(self.db)
+
+
+    def update(self, **kwargs):
+        if 'location' not in kwargs:
+            return super().update(**kwargs)
+
+        with transaction.atomic(using=self.db):
+            locations = set(self.values_list('location', flat=True).distinct())
+            new_location = kwargs['location']
+            moved_pks = None
+
+            if not isinstance(new_location, str):
+                moved_pks = list(self.values_list('pk', flat=True))
+
+            rows = super().update(**kwargs)
 
+            if moved_pks is None:
+                locations.add(new_location)
+            else:
+                locations.update(
+                    self.model._base_manager.using(self.db).filter(pk__in=moved_pks)
+                    .values_list('location', flat=True).distinct()
+                )
 
-class RealEstateListingManager(models.Manager):
+            self._popularity().refresh_locations(locations)
+
+        return rows
+
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            removed = list(self.values('location').annotate(listings=Count('id')).order_by().values_list(
+                'location', 'listings'
+            ))
+            result = super().delete()
+
+            for location, listings in removed:
+                self._popularity().apply_delta(location, -listings)
+
+        return result
+
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            added = {}
+
+            for obj in objs:
+                added[obj.location] = added.get(obj.location, 0) + 1
+
+            if kwargs.get('ignore_conflicts') or kwargs.get('update_conflicts'):
+                self._popularity().refresh_locations(added)
+            else:
+                for location, listings in added.items():
+                    self._popularity().apply_delta(location, listings)
+
+        return objs
+
+
+class RealEstateListingManager(models.Manager.from_queryset(RealEstateListingQuerySet)):
     def by_property_type(self, property_type: str):
         return self.filter(property_type=property_type)
 
@@ -16,13 +109,198 @@ class RealEstateListingManager(models.Manager):
         return self.filter(bedrooms=bedrooms_count)
 
 
-    def popular_locations(self):
-        return self.values('location').annotate(
-            location_count=Count('location')
-        ).order_by('-location_count', 'location')[:2]
+    def search(
+            self,
+            property_type: str = None,
+            bedrooms_count: int = None,
+            min_price: Decimal = None,
+            max_price: Decimal = None,
+            cursor: str = None,
+            page_size: int = 20,
+    ) -> ListingPage:
+        # Equality filters on property_type and bedrooms, then price as the range
+        # and sort key, so the (property_type, bedrooms, price) index serves the
+        # whole query. Pages continue after the last (price, id) seen.
+        filters = Q()
+
+        if property_type is not None:
+            filters &= Q(property_type=property_type)
+
+        if bedrooms_count is not None:
+            filters &= Q(bedrooms=bedrooms_count)
+
+        if min_price is not None:
+            filters &= Q(price__gte=min_price)
+
+        if max_price is not None:
+            filters &= Q(price__lte=max_price)
+
+        if cursor is not None:
+            last_price, last_pk = decode_listing_cursor(cursor)
+            filters &= Q(price__gt=last_price) | Q(price=last_price, pk__gt=last_pk)
+
+        results = list(self.filter(filters).order_by('price', 'pk')[:page_size + 1])
+        next_cursor = None
+
+        if len(results) > page_size:
+            results = results[:page_size]
+            next_cursor = encode_listing_cursor(results[-1].price, results[-1].pk)
+
+        return ListingPage(results, next_cursor)
+
+
+    def popular_locations(self, max_staleness: timedelta = None):
+        # Reads the delta-maintained LocationPopularity table. With max_staleness,
+        # the snapshot stored by refresh_popular_locations_snapshot() is returned
+        # instead, as long as it is not older than the given tolerance.
+        if max_staleness is not None:
+            snapshot = self.model._meta.apps.get_model('main_app', 'LocationPopularitySnapshot').objects.filter(
+                taken_at__gte=timezone.now() - max_staleness
+            ).first()
+
+            if snapshot is not None:
+                return snapshot.locations
+
+        return self.model._meta.apps.get_model('main_app', 'LocationPopularity').objects.top(2)
+
+
+    def refresh_popular_locations_snapshot(self) -> list[dict]:
+        # The snapshot lives in the database, so the scheduled command and the
+        # processes serving popular_locations() all see the same one.
+        locations = list(self.model._meta.apps.get_model('main_app', 'LocationPopularity').objects.top(2))
+        self.model._meta.apps.get_model('main_app', 'LocationPopularitySnapshot').objects.update_or_create(
+            pk=1, defaults={'taken_at': timezone.now(), 'locations': locations}
+        )
+
+        return locations
+
+
+class LocationPopularityManager(models.Manager):
+    def _listings(self):
+        return self.model._meta.apps.get_model('main_app', 'RealEstateListing')._base_manager.using(self._db)
+
+
+    def top(self, limit: int):
+        return self.filter(location_count__gt=0).order_by('-location_count', 'location').values(
+            'location', 'location_count'
+        )[:limit]
+
+
+    def apply_delta(self, location: str, listings: int) -> None:
+        if not self.filter(location=location).update(location_count=F('location_count') + listings):
+            self.get_or_create(location=location)
+            self.filter(location=location).update(location_count=F('location_count') + listings)
+
+
+    def listing_changed(self, previous_location: str | None, current_location: str | None) -> None:
+        if previous_location == current_location:
+            return
+
+        if previous_location is not None:
+            self.apply_delta(previous_location, -1)
+
+        if current_location is not None:
+            self.apply_delta(current_location, 1)
+
+
+    def refresh_locations(self, locations) -> None:
+        locations = set(locations)
+
+        if not locations:
+            return
+
+        counts = self._listings().filter(location__in=locations).values('location').annotate(
+            location_count=Count('id')
+        ).order_by()
+
+        with transaction.atomic(using=self.db):
+            self.bulk_create(
+                [self.model(**row) for row in counts],
+                update_conflicts=True,
+                unique_fields=['location'],
+                update_fields=['location_count'],
+            )
+            self.filter(location__in=locations - {row['location'] for row in counts}).delete()
+
+
+    def rebuild(self) -> int:
+        counts = self._listings().values('location').annotate(location_count=Count('id')).order_by()
+
+        with transaction.atomic(using=self.db):
+            self.all().delete()
+            return len(self.bulk_create([self.model(**row) for row in counts]))
+
+
+class VideoGameQuerySet(models.QuerySet):
+    def _rating_stats(self):
+        return self.model._meta.apps.get_model('main_app', 'VideoGameRatingStats').objects.db_manager(self.db)
+
 
+    def update(self, **kwargs):
+        if 'rating' not in kwargs and 'genre' not in kwargs:
+            return super().update(**kwargs)
 
-class VideoGameManager(models.Manager):
+        with transaction.atomic(using=self.db):
+            genres = set(self.values_list('genre', flat=True).distinct())
+            rows = super().update(**kwargs)
+
+            if isinstance(kwargs.get('genre'), str):
+                genres.add(kwargs['genre'])
+            elif 'genre' in kwargs:
+                genres.update(dict(self.model.GENRE_CHOICES))
+
+            self._rating_stats().refresh(ALL_GENRES, *genres)
+
+        return rows
+
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            removed = list(self.values('genre').annotate(
+                games=Count('id'),
+                total=Sum('rating'),
+                low=Min('rating'),
+                high=Max('rating'),
+            ).order_by().values_list('genre', 'games', 'total', 'low', 'high'))
+            result = super().delete()
+
+            for genre, games, total, low, high in removed:
+                self._rating_stats().games_removed(genre, games, total, low, high)
+
+        return result
+
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            added = {}
+
+            for obj in objs:
+                ratings = added.setdefault(obj.genre, [])
+                ratings.append(obj.rating_state()[1])
+
+            if kwargs.get('ignore_conflicts') or kwargs.get('update_conflicts'):
+                self._rating_stats().refresh(ALL_GENRES, *added)
+            else:
+                for genre, ratings in added.items():
+                    self._rating_stats().games_added(genre, len(ratings), sum(ratings), min(ratings), max(ratings))
+
+        return objs
+
+
+    def bulk_create_validated(self, objs, batch_size: int = None):
+        # bulk_create() skips full_clean(); this validates every row first and
+        # raises BulkValidationError with the per-row report, inserting nothing.
+        objs = list(objs)
+        report = validate_bulk(self.model, objs)
+
+        if report:
+            raise BulkValidationError(report)
+
+        return self.bulk_create(objs, batch_size=batch_size)
+
+
+class VideoGameManager(models.Manager.from_queryset(VideoGameQuerySet)):
     def games_by_genre(self, genre: str):
         return self.filter(genre=genre)
 
@@ -31,14 +309,171 @@ class VideoGameManager(models.Manager):
         return self.filter(release_year__gte=year)
 
 
+    def _rating_stats(self, genre: str = ALL_GENRES):
+        return self.model._meta.apps.get_model('main_app', 'VideoGameRatingStats').objects.db_manager(
+            self.db
+        ).for_genre(genre)
+
+
     def highest_rated_game(self):
-        return self.order_by('-rating').first()
+        stats = self._rating_stats()
+
+        if stats.max_rating is None:
+            return self.order_by('-rating', 'id').first()
+
+        return self.filter(rating=stats.max_rating).order_by('id').first()
 
 
     def lowest_rated_game(self):
-        return self.order_by('rating').first()
+        stats = self._rating_stats()
+
+        if stats.min_rating is None:
+            return self.order_by('rating', 'id').first()
+
+        return self.filter(rating=stats.min_rating).order_by('id').first()
+
+
+    def average_rating(self, genre: str = ALL_GENRES):
+        average_rating = self._rating_stats(genre).average_rating
+
+        if average_rating is None:
+            return None
+
+        return f"{average_rating:.1f}"
+
+
+    def genre_rating_stats(self, genre: str):
+        stats = self._rating_stats(genre)
+
+        return {
+            'games': stats.games,
+            'average_rating': stats.average_rating,
+            'min_rating': stats.min_rating,
+            'max_rating': stats.max_rating,
+        }
+
+
+class VideoGameRatingStatsManager(models.Manager):
+    def _games(self):
+        return self.model._meta.apps.get_model('main_app', 'VideoGame')._base_manager.using(self._db)
+
+
+    def _scope(self, genre: str):
+        games = self._games()
+        return games if genre == ALL_GENRES else games.filter(genre=genre)
+
+
+    def refresh(self, *genres) -> None:
+        for genre in set(genres):
+            stats = self._scope(genre).aggregate(
+                games=Count('id'),
+                rating_sum=Coalesce(Sum('rating'), Value(Decimal('0'))),
+                min_rating=Min('rating'),
+                max_rating=Max('rating'),
+            )
+            self.update_or_create(genre=genre, defaults={**stats, 'bounds_stale': False})
+
+
+    def for_genre(self, genre: str = ALL_GENRES):
+        stats = self.filter(genre=genre).first()
+
+        if stats is None:
+            self.refresh(genre)
+            return self.get(genre=genre)
+
+        if stats.bounds_stale:
+            # Served by the (genre, rating) / (-rating, id) indexes, no full scan.
+            bounds = self._scope(genre).aggregate(min_rating=Min('rating'), max_rating=Max('rating'))
+            self.filter(pk=stats.pk, bounds_stale=True).update(**bounds, bounds_stale=False)
+            stats.min_rating, stats.max_rating = bounds['min_rating'], bounds['max_rating']
+            stats.bounds_stale = False
+
+        return stats
+
+
+    def games_added(self, genre: str, games: int, total: Decimal, low: Decimal, high: Decimal) -> None:
+        for scope in {ALL_GENRES, genre}:
+            updated = self.filter(genre=scope).update(
+                games=F('games') + games,
+                rating_sum=F('rating_sum') + total,
+                min_rating=Coalesce(Least('min_rating', Value(low)), Value(low)),
+                max_rating=Coalesce(Greatest('max_rating', Value(high)), Value(high)),
+            )
+
+            if not updated:
+                self.refresh(scope)
+
+
+    def games_removed(self, genre: str, games: int, total: Decimal, low: Decimal, high: Decimal) -> None:
+        # Sums shrink exactly; a bound is only recomputed, lazily, when a removed
+        # game may have been holding it.
+        for scope in {ALL_GENRES, genre}:
+            updated = self.filter(genre=scope).update(
+                games=F('games') - games,
+                rating_sum=F('rating_sum') - total,
+                bounds_stale=Case(
+                    When(Q(min_rating__gte=low) | Q(max_rating__lte=high), then=Value(True)),
+                    default=F('bounds_stale'),
+                ),
+            )
+
+            if not updated:
+                self.refresh(scope)
+
+
+    def game_changed(self, previous, current) -> None:
+        # previous/current are VideoGame.rating_state() tuples,
+        # None for a game that did not exist before / no longer exists.
+        if previous == current:
+            return
+
+        if previous is not None:
+            genre, rating = previous
+            self.games_removed(genre, 1, rating, rating, rating)
+
+        if current is not None:
+            genre, rating = current
+            self.games_added(genre, 1, rating, rating, rating)
+
+
+class InvoiceManager(models.Manager):
+    # Prefix lookups compile to LIKE 'prefix%'. On PostgreSQL, Django gives the
+    # unique invoice_number a second, varchar_pattern_ops "_like" index, which
+    # serves them whatever the database collation.
+    def with_prefix(self, prefix: str):
+        return self.filter(invoice_number__startswith=prefix)
+
+
+    def count_with_prefix(self, prefix: str) -> int:
+        return self.with_prefix(prefix).count()
+
+
+    def prefix_page(self, prefix: str, cursor: str = None, page_size: int = 50) -> ListingPage:
+        # invoice_number is unique, so it alone is the keyset and the cursor.
+        invoices = self.with_prefix(prefix)
+
+        if cursor is not None:
+            invoices = invoices.filter(invoice_number__gt=cursor)
+
+        results = list(invoices.order_by('invoice_number')[:page_size + 1])
+        next_cursor = None
+
+        if len(results) > page_size:
+            results = results[:page_size]
+            next_cursor = results[-1].invoice_number
+
+        return ListingPage(results, next_cursor)
+
+
+    def in_bulk_with_billing_info(self, invoice_numbers, batch_size: int = 1000) -> dict:
+        # One joined query per batch_size numbers, keyed by invoice number.
+        invoice_numbers = list(dict.fromkeys(invoice_numbers))
+        invoices = {}
+
+        for start in range(0, len(invoice_numbers), batch_size):
+            batch = invoice_numbers[start:start + batch_size]
 
+            for invoice in self.select_related('billing_info').filter(invoice_number__in=batch):
+                invoices[invoice.invoice_number] = invoice
 
-    def average_rating(self):
-        average_rating = self.aggregate(average_rating=Avg('rating'))['average_rating']
-        return f"{average_rating:.1f}"
\ No newline at end of file
+        return invoices
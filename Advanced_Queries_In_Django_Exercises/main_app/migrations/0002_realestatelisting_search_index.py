@@ -0,0 +1,17 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='realestatelisting',
+            index=models.Index(fields=['property_type', 'bedrooms', 'price', 'id'], name='listing_search_idx'),
+        ),
+    ]
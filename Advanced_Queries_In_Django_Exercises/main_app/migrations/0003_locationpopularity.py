@@ -0,0 +1,34 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:27
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def build_location_popularity(apps, schema_editor):
+    RealEstateListing = apps.get_model('main_app', 'RealEstateListing')
+    LocationPopularity = apps.get_model('main_app', 'LocationPopularity')
+
+    counts = RealEstateListing.objects.values('location').annotate(location_count=Count('id')).order_by()
+    LocationPopularity.objects.bulk_create([LocationPopularity(**row) for row in counts])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0002_realestatelisting_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocationPopularity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location', models.CharField(max_length=100, unique=True)),
+                ('location_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-location_count', 'location'], name='location_popularity_top_idx')],
+            },
+        ),
+        migrations.RunPython(build_location_popularity, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:29
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+
+
+def build_rating_stats(apps, schema_editor):
+    VideoGame = apps.get_model('main_app', 'VideoGame')
+    VideoGameRatingStats = apps.get_model('main_app', 'VideoGameRatingStats')
+    aggregates = {
+        'games': Count('id'),
+        'rating_sum': Sum('rating'),
+        'min_rating': Min('rating'),
+        'max_rating': Max('rating'),
+    }
+
+    stats = [VideoGameRatingStats(genre='', **VideoGame.objects.aggregate(**aggregates))]
+    stats += [
+        VideoGameRatingStats(**row)
+        for row in VideoGame.objects.values('genre').annotate(**aggregates).order_by()
+    ]
+
+    for row in stats:
+        row.rating_sum = row.rating_sum or Decimal('0')
+
+    VideoGameRatingStats.objects.bulk_create(stats)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0003_locationpopularity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VideoGameRatingStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('genre', models.CharField(blank=True, max_length=100, unique=True)),
+                ('games', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.DecimalField(decimal_places=1, default=0, max_digits=14)),
+                ('min_rating', models.DecimalField(blank=True, decimal_places=1, max_digits=2, null=True)),
+                ('max_rating', models.DecimalField(blank=True, decimal_places=1, max_digits=2, null=True)),
+                ('bounds_stale', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='videogame',
+            index=models.Index(fields=['-rating', 'id'], name='videogame_rating_desc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='videogame',
+            index=models.Index(fields=['genre', 'rating'], name='videogame_genre_rating_idx'),
+        ),
+        migrations.RunPython(build_rating_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:31
+
+from django.db import migrations
+
+
+POSTGRESQL_INSTALL = [
+    """
+    ALTER TABLE main_app_task ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX main_app_task_search_vector_idx ON main_app_task USING GIN (search_vector)",
+]
+POSTGRESQL_UNINSTALL = [
+    "ALTER TABLE main_app_task DROP COLUMN IF EXISTS search_vector",
+]
+
+# External-content FTS5 table; the triggers keep it in step with every write,
+# bulk_create() and queryset update()/delete() included.
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE main_app_task_fts USING fts5(
+        title, description, content='main_app_task', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER main_app_task_fts_insert AFTER INSERT ON main_app_task BEGIN
+        INSERT INTO main_app_task_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER main_app_task_fts_delete AFTER DELETE ON main_app_task BEGIN
+        INSERT INTO main_app_task_fts (main_app_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER main_app_task_fts_update AFTER UPDATE OF title, description ON main_app_task BEGIN
+        INSERT INTO main_app_task_fts (main_app_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO main_app_task_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO main_app_task_fts (main_app_task_fts) VALUES ('rebuild')",
+]
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS main_app_task_fts_insert",
+    "DROP TRIGGER IF EXISTS main_app_task_fts_delete",
+    "DROP TRIGGER IF EXISTS main_app_task_fts_update",
+    "DROP TABLE IF EXISTS main_app_task_fts",
+]
+
+
+def run_for_vendor(postgresql, sqlite):
+    def run(apps, schema_editor):
+        statements = {'postgresql': postgresql, 'sqlite': sqlite}.get(schema_editor.connection.vendor, [])
+
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0004_videogameratingstats'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(POSTGRESQL_INSTALL, SQLITE_INSTALL),
+            run_for_vendor(POSTGRESQL_UNINSTALL, SQLITE_UNINSTALL),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.4 on 2026-10-19 12:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0005_task_full_text_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exercise',
+            index=models.Index(fields=['duration_minutes', 'difficulty_level'], name='exercise_duration_diff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=models.Index(fields=['difficulty_level', 'repetitions'], name='exercise_difficulty_reps_idx'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:33
+
+import main_app.functions
+from django.db import migrations, models
+
+
+# Adding the stored column remakes the table on SQLite, dropping the triggers
+# that keep the full-text index in sync.
+SQLITE_SEARCH_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS main_app_task_fts_insert",
+    "DROP TRIGGER IF EXISTS main_app_task_fts_delete",
+    "DROP TRIGGER IF EXISTS main_app_task_fts_update",
+    """
+    CREATE TRIGGER main_app_task_fts_insert AFTER INSERT ON main_app_task BEGIN
+        INSERT INTO main_app_task_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER main_app_task_fts_delete AFTER DELETE ON main_app_task BEGIN
+        INSERT INTO main_app_task_fts (main_app_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER main_app_task_fts_update AFTER UPDATE OF title, description ON main_app_task BEGIN
+        INSERT INTO main_app_task_fts (main_app_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO main_app_task_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+
+def reinstall_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for statement in SQLITE_SEARCH_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0007_exercise_range_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, reinstall_search_triggers),
+        migrations.AddField(
+            model_name='task',
+            name='duration_days',
+            field=models.GeneratedField(db_persist=True, expression=main_app.functions.DaysBetween('completion_date', 'creation_date'), output_field=models.IntegerField()),
+        ),
+        migrations.RunPython(reinstall_search_triggers, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', False), ('priority', 'High')), fields=['duration_days'], name='task_ongoing_high_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', True), ('priority', 'Medium')), fields=['id'], name='task_completed_medium_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', True)), fields=['duration_days'], name='task_completed_duration_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.4 on 2026-10-19 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0008_task_duration_days'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocationPopularitySnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField()),
+                ('locations', models.JSONField(default=list)),
+            ],
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.db import router, transaction
+
+
+class LockedDeltaMixin:
+    # For models whose writes keep a summary table in step through deltas.
+    # save() and delete() read the state before the write under a row lock
+    # rather than trusting the values loaded earlier, so queryset updates and
+    # concurrent writers cannot make the summary drift. Subclasses name the
+    # state columns and provide summary_state() and summary_changed().
+    summary_fields: tuple[str, ...] = ()
+
+
+    def summary_state(self) -> tuple:
+        raise NotImplementedError
+
+
+    def summary_changed(self, using: str, previous: tuple | None, current: tuple | None) -> None:
+        raise NotImplementedError
+
+
+    def _stored_summary_state(self, using: str) -> tuple | None:
+        if self.pk is None:
+            return None
+
+        return type(self)._base_manager.using(using).select_for_update().filter(pk=self.pk).values_list(
+            *self.summary_fields
+        ).first()
+
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+
+        with transaction.atomic(using=using):
+            previous = self._stored_summary_state(using)
+            super().save(*args, **kwargs)
+            self.summary_changed(self._state.db, previous, self.summary_state())
+
+
+    def delete(self, *args, **kwargs):
+        using = kwargs.get('using') or self._state.db
+
+        with transaction.atomic(using=using):
+            previous = self._stored_summary_state(using)
+            result = super().delete(*args, **kwargs)
+            self.summary_changed(using, previous, None)
+
+        return result
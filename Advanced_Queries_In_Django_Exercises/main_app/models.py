@@ -1,17 +1,19 @@
-from datetime import timedelta
-
 from django.db import models
 
-from main_app.managers import RealEstateListingManager, VideoGameManager
+from main_app.functions import DaysBetween
+from main_app.managers import InvoiceManager, LocationPopularityManager, RealEstateListingManager
+from main_app.managers import VideoGameManager, VideoGameRatingStatsManager
+from main_app.mixins import LockedDeltaMixin
+from main_app.search import full_text_search, substring_search
 from main_app.validators import RangeValidator
 from decimal import Decimal
-from django.db.models import F, Q
+from django.db.models import Q
 
 
 # Create your models here.
 
 
-class RealEstateListing(models.Model):
+class RealEstateListing(LockedDeltaMixin, models.Model):
     PROPERTY_TYPE_CHOICES = [
         ('House', 'House'),
         ('Flat', 'Flat'),
@@ -27,8 +29,43 @@ class RealEstateListing(models.Model):
 
     objects = RealEstateListingManager()
 
+    summary_fields = ('location',)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['property_type', 'bedrooms', 'price', 'id'], name='listing_search_idx'),
+        ]
+
+
+    def summary_state(self):
+        return (self.location,)
+
+
+    def summary_changed(self, using, previous, current):
+        LocationPopularity.objects.db_manager(using).listing_changed(
+            previous[0] if previous else None, current[0] if current else None
+        )
+
+
+class LocationPopularity(models.Model):
+    location = models.CharField(max_length=100, unique=True)
+    location_count = models.PositiveIntegerField(default=0)
+
+    objects = LocationPopularityManager()
 
-class VideoGame(models.Model):
+    class Meta:
+        indexes = [
+            models.Index(fields=['-location_count', 'location'], name='location_popularity_top_idx'),
+        ]
+
+
+class LocationPopularitySnapshot(models.Model):
+    # A single row, replaced by each refresh_location_popularity run.
+    taken_at = models.DateTimeField()
+    locations = models.JSONField(default=list)
+
+
+class VideoGame(LockedDeltaMixin, models.Model):
     GENRE_CHOICES = [
         ('Action', 'Action'),
         ('RPG', 'RPG'),
@@ -54,11 +91,52 @@ class VideoGame(models.Model):
 
     objects = VideoGameManager()
 
+    summary_fields = ('genre', 'rating')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-rating', 'id'], name='videogame_rating_desc_idx'),
+            models.Index(fields=['genre', 'rating'], name='videogame_genre_rating_idx'),
+        ]
+
 
     def __str__(self):
         return self.title
 
 
+    def rating_state(self):
+        # to_python() rounds float ratings to the field's precision, as saving does.
+        return self.genre, self._meta.get_field('rating').to_python(self.rating)
+
+
+    def summary_state(self):
+        return self.rating_state()
+
+
+    def summary_changed(self, using, previous, current):
+        VideoGameRatingStats.objects.db_manager(using).game_changed(previous, current)
+
+
+class VideoGameRatingStats(models.Model):
+    # genre='' holds the stats of all games together.
+    genre = models.CharField(max_length=100, unique=True, blank=True)
+    games = models.PositiveIntegerField(default=0)
+    rating_sum = models.DecimalField(max_digits=14, decimal_places=1, default=0)
+    min_rating = models.DecimalField(max_digits=2, decimal_places=1, null=True, blank=True)
+    max_rating = models.DecimalField(max_digits=2, decimal_places=1, null=True, blank=True)
+    bounds_stale = models.BooleanField(default=False)
+
+    objects = VideoGameRatingStatsManager()
+
+
+    @property
+    def average_rating(self):
+        if not self.games:
+            return None
+
+        return self.rating_sum / self.games
+
+
 class BillingInfo(models.Model):
     address = models.CharField(max_length=200)
 
@@ -67,10 +145,17 @@ class Invoice(models.Model):
     invoice_number = models.CharField(max_length=20, unique=True)
     billing_info = models.OneToOneField(BillingInfo, on_delete=models.CASCADE)
 
+    objects = InvoiceManager()
+
 
     @classmethod
     def get_invoices_with_prefix(cls, prefix: str):
-        return cls.objects.filter(invoice_number__startswith=prefix)
+        return cls.objects.with_prefix(prefix)
+
+
+    @classmethod
+    def count_invoices_with_prefix(cls, prefix: str) -> int:
+        return cls.objects.count_with_prefix(prefix)
 
 
     @classmethod
@@ -83,6 +168,11 @@ class Invoice(models.Model):
         return cls.objects.select_related('billing_info').get(invoice_number=invoice_number)
 
 
+    @classmethod
+    def get_invoices_with_billing_info(cls, invoice_numbers) -> dict:
+        return cls.objects.in_bulk_with_billing_info(invoice_numbers)
+
+
 class Technology(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField()
@@ -120,6 +210,32 @@ class Task(models.Model):
     is_completed = models.BooleanField(default=False)
     creation_date = models.DateField()
     completion_date = models.DateField()
+    # completion_date - creation_date, stored so the date comparisons below
+    # become plain range conditions an index can serve.
+    duration_days = models.GeneratedField(
+        expression=DaysBetween('completion_date', 'creation_date'),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['duration_days'],
+                name='task_ongoing_high_idx',
+                condition=Q(priority='High', is_completed=False),
+            ),
+            models.Index(
+                fields=['id'],
+                name='task_completed_medium_idx',
+                condition=Q(priority='Medium', is_completed=True),
+            ),
+            models.Index(
+                fields=['duration_days'],
+                name='task_completed_duration_idx',
+                condition=Q(is_completed=True),
+            ),
+        ]
 
 
     @classmethod
@@ -127,7 +243,7 @@ class Task(models.Model):
         return cls.objects.filter(
             priority="High",
             is_completed=False,
-            completion_date__gt=F('creation_date')
+            duration_days__gt=0
         )
 
 
@@ -140,16 +256,21 @@ class Task(models.Model):
 
 
     @classmethod
-    def search_tasks(cls, query: str):
-        filtering_query = Q(title__icontains=query) | Q(description__icontains=query)
-        return cls.objects.filter(filtering_query)
+    def search_tasks(cls, query: str, full_text: bool = False):
+        if full_text:
+            results = full_text_search(cls.objects.all(), query)
+
+            if results is not None:
+                return results
+
+        return substring_search(cls.objects.all(), query)
 
 
     @classmethod
     def recent_completed_tasks(cls, days: int):
         return cls.objects.filter(
             is_completed=True,
-            completion_date__gte=F('creation_date') - timedelta(days=days)
+            duration_days__gte=-days
         )
 
 
@@ -160,6 +281,14 @@ class Exercise(models.Model):
     duration_minutes = models.PositiveIntegerField()
     repetitions = models.PositiveIntegerField()
 
+    class Meta:
+        indexes = [
+            # Duration first: it bounds the duration range and the long/hard and
+            # short/easy lookups, with the difficulty check done inside the index.
+            models.Index(fields=['duration_minutes', 'difficulty_level'], name='exercise_duration_diff_idx'),
+            models.Index(fields=['difficulty_level', 'repetitions'], name='exercise_difficulty_reps_idx'),
+        ]
+
 
     @classmethod
     def get_long_and_hard_exercises(cls):
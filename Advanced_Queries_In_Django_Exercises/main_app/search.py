@@ -0,0 +1,64 @@
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, TextField
+from django.db.models.expressions import RawSQL
+
+
+TASK_TABLE = 'main_app_task'
+TASK_FTS_TABLE = 'main_app_task_fts'
+TEXT_SEARCH_CONFIG = 'english'
+
+
+def _fts5_query(query: str) -> str:
+    # Every word quoted, so user input can never be read as FTS5 syntax.
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+
+
+def full_text_search(queryset, query: str):
+    # Rank-ordered matches annotated with search_rank, title_highlight and
+    # description_highlight, or None when the backend has no full-text index.
+    vendor = connections[queryset.db].vendor
+
+    if not query.split():
+        return queryset.none()
+
+    if vendor == 'postgresql':
+        tsquery = f"plainto_tsquery('{TEXT_SEARCH_CONFIG}', %s)"
+
+        return queryset.filter(
+            RawSQL(f"{TASK_TABLE}.search_vector @@ {tsquery}", [query], output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(f"ts_rank({TASK_TABLE}.search_vector, {tsquery})", [query], output_field=FloatField()),
+            title_highlight=RawSQL(
+                f"ts_headline('{TEXT_SEARCH_CONFIG}', {TASK_TABLE}.title, {tsquery})", [query], output_field=TextField()
+            ),
+            description_highlight=RawSQL(
+                f"ts_headline('{TEXT_SEARCH_CONFIG}', {TASK_TABLE}.description, {tsquery}, 'MaxWords=30, MinWords=10')",
+                [query],
+                output_field=TextField(),
+            ),
+        ).order_by('-search_rank', 'id')
+
+    if vendor == 'sqlite':
+        match = _fts5_query(query)
+        matching = f"FROM {TASK_FTS_TABLE} WHERE {TASK_FTS_TABLE} MATCH %s AND {TASK_FTS_TABLE}.rowid = {TASK_TABLE}.id"
+
+        return queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {TASK_FTS_TABLE} WHERE {TASK_FTS_TABLE} MATCH %s", [match])
+        ).annotate(
+            # bm25() is lower for better matches, negated so higher ranks first on both backends.
+            search_rank=RawSQL(f"(SELECT -bm25({TASK_FTS_TABLE}, 10.0, 1.0) {matching})", [match], output_field=FloatField()),
+            title_highlight=RawSQL(
+                f"(SELECT highlight({TASK_FTS_TABLE}, 0, '<b>', '</b>') {matching})", [match], output_field=TextField()
+            ),
+            description_highlight=RawSQL(
+                f"(SELECT snippet({TASK_FTS_TABLE}, 1, '<b>', '</b>', '...', 30) {matching})",
+                [match],
+                output_field=TextField(),
+            ),
+        ).order_by('-search_rank', 'id')
+
+    return None
+
+
+def substring_search(queryset, query: str):
+    return queryset.filter(Q(title__icontains=query) | Q(description__icontains=query))
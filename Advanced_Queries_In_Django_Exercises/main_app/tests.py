@@ -1,3 +1,208 @@
+import datetime
+import random
+from decimal import Decimal
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+
+from main_app.bulk_validation import BulkValidationError, validate_bulk
+from main_app.models import Exercise, LocationPopularity, LocationPopularitySnapshot, RealEstateListing, Task, VideoGame
+
+
+class LocationPopularityTests(TestCase):
+    def counts(self):
+        return dict(LocationPopularity.objects.filter(location_count__gt=0).values_list('location', 'location_count'))
+
+    def listing(self, location):
+        return RealEstateListing.objects.create(property_type='Flat', price=100, bedrooms=1, location=location)
+
+    def test_counts_follow_listing_writes(self):
+        sofia = self.listing('Sofia')
+        self.listing('Sofia')
+        varna = self.listing('Varna')
+        self.assertEqual(self.counts(), {'Sofia': 2, 'Varna': 1})
+
+        sofia.location = 'Varna'
+        sofia.save()
+        self.assertEqual(self.counts(), {'Sofia': 1, 'Varna': 2})
+
+        RealEstateListing.objects.filter(location='Varna').update(location='Burgas')
+        self.assertEqual(self.counts(), {'Sofia': 1, 'Burgas': 2})
+
+        varna.refresh_from_db()
+        varna.delete()
+        RealEstateListing.objects.filter(location='Sofia').delete()
+        self.assertEqual(self.counts(), {'Burgas': 1})
+
+    def test_save_of_a_stale_instance_uses_the_stored_location(self):
+        listing = self.listing('Sofia')
+        RealEstateListing.objects.filter(pk=listing.pk).update(location='Varna')
+
+        listing.price = 200
+        listing.save()
+
+        self.assertEqual(self.counts(), {'Sofia': 1})
+
+
+class PopularLocationsSnapshotTests(TestCase):
+    def test_stale_reads_use_the_snapshot_stored_by_the_command(self):
+        RealEstateListing.objects.create(property_type='Flat', price=100, bedrooms=1, location='Sofia')
+        call_command('refresh_location_popularity', stdout=StringIO())
+        RealEstateListing.objects.create(property_type='Flat', price=100, bedrooms=1, location='Varna')
+        RealEstateListing.objects.create(property_type='Flat', price=100, bedrooms=1, location='Varna')
+
+        self.assertEqual(
+            RealEstateListing.objects.popular_locations(max_staleness=datetime.timedelta(minutes=5)),
+            [{'location': 'Sofia', 'location_count': 1}],
+        )
+        self.assertEqual(
+            list(RealEstateListing.objects.popular_locations()),
+            [{'location': 'Varna', 'location_count': 2}, {'location': 'Sofia', 'location_count': 1}],
+        )
+
+    def test_an_expired_snapshot_falls_back_to_the_live_table(self):
+        RealEstateListing.objects.create(property_type='Flat', price=100, bedrooms=1, location='Sofia')
+        RealEstateListing.objects.refresh_popular_locations_snapshot()
+        LocationPopularitySnapshot.objects.update(taken_at=timezone.now() - datetime.timedelta(hours=1))
+        RealEstateListing.objects.create(property_type='Flat', price=100, bedrooms=1, location='Varna')
+
+        self.assertEqual(
+            len(RealEstateListing.objects.popular_locations(max_staleness=datetime.timedelta(minutes=5))), 2
+        )
+
+
+class VideoGameRatingStatsTests(TestCase):
+    def test_float_ratings_are_accepted(self):
+        VideoGame.objects.create(title='Float', genre='RPG', release_year=2000, rating=4.3)
+        VideoGame.objects.bulk_create([VideoGame(title='Bulk', genre='RPG', release_year=2001, rating=6.1)])
+
+        stats = VideoGame.objects.genre_rating_stats('RPG')
+        self.assertEqual(stats['games'], 2)
+        self.assertEqual(stats['average_rating'], Decimal('5.2'))
+        self.assertEqual(VideoGame.objects.highest_rated_game().title, 'Bulk')
+
+    def test_save_uses_the_stored_rating(self):
+        game = VideoGame.objects.create(title='Game', genre='RPG', release_year=2000, rating=Decimal('3.0'))
+        VideoGame.objects.filter(pk=game.pk).update(rating=Decimal('9.0'))
+
+        game.rating = Decimal('5.0')
+        game.save()
+
+        self.assertEqual(VideoGame.objects.genre_rating_stats('RPG')['average_rating'], Decimal('5.0'))
+
+
+class ValidateBulkTests(TestCase):
+    def test_reports_what_full_clean_reports(self):
+        games = [
+            VideoGame(title='Strings', genre='RPG', release_year='2000', rating='5.5'),
+            VideoGame(title='Float', genre='RPG', release_year=2001, rating=4.3),
+            VideoGame(title='x' * 101, genre='Nope', release_year=1980, rating=Decimal('11.0')),
+            VideoGame(title='Type', genre='RPG', release_year='abc', rating=Decimal('1.25')),
+        ]
+        expected = {}
+
+        for row, game in enumerate(games):
+            try:
+                VideoGame(**{f.attname: getattr(game, f.attname) for f in VideoGame._meta.concrete_fields}).full_clean()
+            except ValidationError as e:
+                expected[row] = e.message_dict
+
+        self.assertEqual(validate_bulk(VideoGame, games), expected)
+        self.assertEqual(sorted(expected), [2, 3])
+
+    def test_bulk_create_validated_inserts_converted_values(self):
+        VideoGame.objects.bulk_create_validated([
+            VideoGame(title='Strings', genre='RPG', release_year='2000', rating='5.5'),
+            VideoGame(title='Float', genre='RPG', release_year=2001, rating=4.3),
+        ])
+
+        self.assertEqual(
+            list(VideoGame.objects.order_by('id').values_list('release_year', 'rating')),
+            [(2000, Decimal('5.5')), (2001, Decimal('4.3'))],
+        )
+
+    def test_bulk_create_validated_inserts_nothing_when_a_row_is_invalid(self):
+        with self.assertRaises(BulkValidationError) as raised:
+            VideoGame.objects.bulk_create_validated([
+                VideoGame(title='Valid', genre='RPG', release_year=2000, rating=Decimal('5.0')),
+                VideoGame(title='Invalid', genre='RPG', release_year=2050, rating=Decimal('5.0')),
+            ])
+
+        self.assertEqual(raised.exception.report, {
+            1: {'release_year': ['The release year must be between 1990 and 2023']},
+        })
+        self.assertFalse(VideoGame.objects.exists())
+
+
+class ExerciseQueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Enough rows, with planner statistics, for an index to beat a scan.
+        rng = random.Random(0)
+        Exercise.objects.bulk_create(
+            Exercise(
+                name=f'Exercise {i}',
+                category='Strength',
+                difficulty_level=round(rng.triangular(1, 20, 6)),
+                duration_minutes=round(rng.triangular(5, 90, 25)),
+                repetitions=rng.randint(1, 50),
+            )
+            for i in range(5000)
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Exercise._meta.db_table}')
+
+    def assertUsesIndex(self, queryset, *index_names):
+        plan = queryset.explain()
+        self.assertTrue(any(name in plan for name in index_names), plan)
+
+    def test_short_and_easy_exercises_use_an_index(self):
+        self.assertUsesIndex(
+            Exercise.get_short_and_easy_exercises(), 'exercise_duration_diff_idx', 'exercise_difficulty_reps_idx'
+        )
+
+    def test_exercises_within_duration_use_the_duration_index(self):
+        self.assertUsesIndex(Exercise.get_exercises_within_duration(44, 46), 'exercise_duration_diff_idx')
+
+    def test_difficulty_and_repetitions_use_the_difficulty_index(self):
+        self.assertUsesIndex(
+            Exercise.get_exercises_with_difficulty_and_repetitions(18, 45), 'exercise_difficulty_reps_idx'
+        )
+
+
+class TaskQueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(0)
+        today = datetime.date(2024, 1, 1)
+        Task.objects.bulk_create(
+            Task(
+                title=f'Task {i}',
+                description='',
+                priority=rng.choices(['Low', 'Medium', 'High'], weights=[60, 25, 15])[0],
+                is_completed=rng.random() < 0.5,
+                creation_date=today,
+                completion_date=today + datetime.timedelta(days=rng.randint(-365, 60)),
+            )
+            for i in range(5000)
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Task._meta.db_table}')
+
+    def assertUsesIndex(self, queryset, index_name):
+        self.assertIn(index_name, queryset.explain())
+
+    def test_ongoing_high_priority_tasks_use_their_partial_index(self):
+        self.assertUsesIndex(Task.ongoing_high_priority_tasks(), 'task_ongoing_high_idx')
+
+    def test_completed_mid_priority_tasks_use_their_partial_index(self):
+        self.assertUsesIndex(Task.completed_mid_priority_tasks(), 'task_completed_medium_idx')
 
-# Create your tests here.
+    def test_recent_completed_tasks_use_their_partial_index(self):
+        self.assertUsesIndex(Task.recent_completed_tasks(7), 'task_completed_duration_idx')
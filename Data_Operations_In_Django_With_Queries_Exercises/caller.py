@@ -12,6 +12,7 @@ django.setup()
 from main_app.models import Pet
 from main_app.models import Artifact
 from main_app.models import Location
+from main_app.models import RegionRollup
 from main_app.models import Car
 from main_app.models import Task
 from main_app.models import HotelRoom
@@ -48,7 +49,7 @@ def rename_artifact(artifact: Artifact, new_name: str):
 
 
 def delete_all_artifacts():
-    Artifact.objects.all().delete()
+    Artifact.objects.truncate()
 
 
 def show_all_locations() -> str:
@@ -72,6 +73,17 @@ def delete_first_location() -> None:
     Location.objects.first().delete()
 
 
+def show_region_populations() -> str:
+    rollups = RegionRollup.objects.dashboard()
+
+    return '\n'.join(f"{r.region} has {r.location_count} locations with a population of {r.total_population}!"
+                     for r in rollups)
+
+
+def get_region_capitals() -> QuerySet[dict]:
+    return RegionRollup.objects.capitals()
+
+
 def apply_discount():
     cars = Car.objects.all()
 
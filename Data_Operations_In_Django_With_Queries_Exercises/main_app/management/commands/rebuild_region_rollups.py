@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from main_app.models import RegionRollup
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the per-region Location rollups with a single GROUP BY.'
+
+    def handle(self, *args, **options):
+        regions = RegionRollup.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rollups for {regions} regions."))
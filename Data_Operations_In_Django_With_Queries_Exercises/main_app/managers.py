@@ -0,0 +1,264 @@
+from django.core.management.color import no_style
+from django.db import connections, models, router, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum, Window
+from django.db.models.functions import Rank
+
+from main_app.signals import post_truncate
+
+
+def power_rank_window():
+    return Window(
+        expression=Rank(),
+        partition_by=F('class_name'),
+        order_by=F('power_score').desc(),
+    )
+
+
+class TruncateManager(models.Manager):
+    def truncate(self, allow_cascade: bool = False) -> None:
+        referencing_models = sorted({
+            f.related_model._meta.label
+            for f in self.model._meta.get_fields(include_hidden=True)
+            if f.auto_created and not f.concrete and (f.one_to_many or f.one_to_one)
+        })
+
+        if referencing_models and not allow_cascade:
+            raise ValueError(
+                f"Cannot truncate {self.model._meta.label}, it is referenced by "
+                f"{', '.join(referencing_models)}. Pass allow_cascade=True to clear them too."
+            )
+
+        using = router.db_for_write(self.model)
+        connection = connections[using]
+        tables = [self.model._meta.db_table]
+
+        with transaction.atomic(using=using):
+            # TRUNCATE ... RESTART IDENTITY on PostgreSQL, DELETE plus a
+            # sqlite_sequence reset on SQLite; no per-row collector either way.
+            sql_list = connection.ops.sql_flush(
+                no_style(), tables, reset_sequences=True, allow_cascade=allow_cascade
+            )
+            connection.ops.execute_sql_flush(sql_list)
+
+            transaction.on_commit(
+                lambda: post_truncate.send(sender=self.model, using=using, cascade=allow_cascade),
+                using=using,
+            )
+
+
+class CharacterManager(models.Manager):
+    def top_by_power(self, class_name: str, limit: int = 10):
+        return self.filter(class_name=class_name).annotate(
+            power_rank=power_rank_window()
+        ).order_by('power_rank', 'id')[:limit]
+
+
+    def top_by_power_per_class(self, limit: int = 10):
+        return self.annotate(
+            power_rank=power_rank_window()
+        ).filter(power_rank__lte=limit).order_by('class_name', 'power_rank', 'id')
+
+
+    def power_rank_of(self, character_id: int):
+        # Same value as the Rank() window, but counted through the
+        # (class_name, power_score) index instead of ranking the whole class.
+        character = self.filter(pk=character_id).values('class_name', 'power_score').first()
+
+        if character is None:
+            return None
+
+        return self.filter(
+            class_name=character['class_name'],
+            power_score__gt=character['power_score'],
+        ).count() + 1
+
+
+# Location columns that feed the per-region rollups, in Location.rollup_state() order.
+ROLLUP_FIELDS_ORDER = ('region', 'population', 'is_capital', 'name')
+ROLLUP_FIELDS = set(ROLLUP_FIELDS_ORDER)
+
+
+class LocationQuerySet(models.QuerySet):
+    def _rollups(self):
+        return self.model._meta.apps.get_model('main_app', 'RegionRollup').objects
+
+
+    def update(self, **kwargs):
+        if ROLLUP_FIELDS.isdisjoint(kwargs):
+            return super().update(**kwargs)
+
+        with transaction.atomic(using=self.db):
+            regions = set(self.values_list('region', flat=True).distinct())
+            new_region = kwargs.get('region')
+            moved_pks = None
+
+            if new_region is not None and not isinstance(new_region, str):
+                # Computed regions are only known after the write, and the rows
+                # may no longer match this queryset's filter by then.
+                moved_pks = list(self.values_list('pk', flat=True))
+
+            rows = super().update(**kwargs)
+
+            if isinstance(new_region, str):
+                regions.add(new_region)
+            elif moved_pks is not None:
+                regions.update(
+                    self.model._base_manager.using(self.db).filter(pk__in=moved_pks)
+                    .values_list('region', flat=True).distinct()
+                )
+
+            self._rollups().db_manager(self.db).refresh_regions(regions)
+
+        return rows
+
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            regions = set(self.values_list('region', flat=True).distinct())
+            result = super().delete()
+            self._rollups().db_manager(self.db).refresh_regions(regions)
+
+        return result
+
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            rollups = self._rollups().db_manager(self.db)
+
+            if kwargs.get('ignore_conflicts') or kwargs.get('update_conflicts'):
+                rollups.refresh_regions({obj.region for obj in objs})
+            else:
+                added = {}
+
+                for obj in objs:
+                    population, count = added.get(obj.region, (0, 0))
+                    added[obj.region] = (population + obj.population, count + 1)
+
+                for region, (population, count) in added.items():
+                    rollups.apply_delta(region, population, count)
+
+                rollups.refresh_capitals({obj.region for obj in objs if obj.is_capital})
+
+        return objs
+
+
+class RegionRollupManager(models.Manager):
+    def _locations(self):
+        return self.model._meta.apps.get_model('main_app', 'Location')._base_manager.using(self._db)
+
+
+    def dashboard(self):
+        return self.filter(location_count__gt=0).order_by('region')
+
+
+    def capitals(self):
+        return self.filter(capital__isnull=False).order_by('region').values('region', 'capital')
+
+
+    def for_region(self, region: str):
+        return self.filter(region=region).first()
+
+
+    def apply_delta(self, region: str, population: int = 0, count: int = 0) -> None:
+        delta = {
+            'total_population': F('total_population') + population,
+            'location_count': F('location_count') + count,
+        }
+
+        if not self.filter(region=region).update(**delta):
+            self.get_or_create(region=region)
+            self.filter(region=region).update(**delta)
+
+
+    def refresh_capitals(self, regions) -> None:
+        if not regions:
+            return
+
+        self.filter(region__in=regions).update(capital=Subquery(
+            self._locations().filter(
+                region=OuterRef('region'),
+                is_capital=True,
+            ).order_by('id').values('name')[:1]
+        ))
+
+
+    def location_changed(self, previous, current) -> None:
+        # previous/current are Location.rollup_state() tuples,
+        # None for a location that did not exist before / no longer exists.
+        if previous == current:
+            return
+
+        capital_regions = set()
+
+        if previous is not None and current is not None and previous[0] == current[0]:
+            region, population, is_capital, _ = current
+
+            if population != previous[1]:
+                self.apply_delta(region, population - previous[1])
+
+            if is_capital or previous[2]:
+                self.refresh_capitals({region})
+
+            return
+
+        if previous is not None:
+            region, population, is_capital, _ = previous
+            self.apply_delta(region, -population, -1)
+
+            if is_capital:
+                capital_regions.add(region)
+
+        if current is not None:
+            region, population, is_capital, _ = current
+            self.apply_delta(region, population, 1)
+
+            if is_capital:
+                capital_regions.add(region)
+
+        if capital_regions:
+            self.refresh_capitals(capital_regions)
+
+
+    def refresh_regions(self, regions) -> None:
+        if regions is None:
+            return self.rebuild()
+
+        regions = set(regions)
+
+        if not regions:
+            return
+
+        totals = self._locations().filter(region__in=regions).values('region').annotate(
+            total_population=Sum('population'),
+            location_count=Count('id'),
+        ).order_by()
+
+        with transaction.atomic(using=self.db):
+            self.bulk_create(
+                [self.model(**row) for row in totals],
+                update_conflicts=True,
+                unique_fields=['region'],
+                update_fields=['total_population', 'location_count'],
+            )
+            self.filter(region__in=regions - {row['region'] for row in totals}).delete()
+            self.refresh_capitals(regions)
+
+
+    def rebuild(self) -> int:
+        totals = self._locations().values('region').annotate(
+            total_population=Sum('population'),
+            location_count=Count('id'),
+        ).order_by()
+
+        with transaction.atomic(using=self.db):
+            self.all().delete()
+            rollups = self.bulk_create([self.model(**row) for row in totals])
+            self.update(capital=Subquery(
+                self._locations().filter(
+                    region=OuterRef('region'),
+                    is_capital=True,
+                ).order_by('id').values('name')[:1]
+            ))
+
+        return len(rollups)
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:17
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0007_character'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='character',
+            name='power_score',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('level'), '*', models.Value(10)), '+', django.db.models.expressions.CombinedExpression(models.F('strength'), '*', models.Value(3))), '+', django.db.models.expressions.CombinedExpression(models.F('dexterity'), '*', models.Value(2))), '+', django.db.models.expressions.CombinedExpression(models.F('intelligence'), '*', models.Value(2))), '+', django.db.models.expressions.CombinedExpression(models.F('hit_points'), '*', models.Value(1))), output_field=models.BigIntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='character',
+            index=models.Index(fields=['class_name', '-power_score', 'id'], name='character_class_power_idx'),
+        ),
+    ]
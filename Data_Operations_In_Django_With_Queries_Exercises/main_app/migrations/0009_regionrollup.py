@@ -0,0 +1,47 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:19
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+
+
+def build_region_rollups(apps, schema_editor):
+    Location = apps.get_model('main_app', 'Location')
+    RegionRollup = apps.get_model('main_app', 'RegionRollup')
+
+    totals = Location.objects.values('region').annotate(
+        total_population=Sum('population'),
+        location_count=Count('id'),
+    ).order_by()
+
+    RegionRollup.objects.bulk_create([RegionRollup(**row) for row in totals])
+    RegionRollup.objects.update(capital=Subquery(
+        Location.objects.filter(
+            region=OuterRef('region'),
+            is_capital=True,
+        ).order_by('id').values('name')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0008_character_power_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('region', models.CharField(max_length=50, unique=True)),
+                ('total_population', models.PositiveBigIntegerField(default=0)),
+                ('location_count', models.PositiveIntegerField(default=0)),
+                ('capital', models.CharField(blank=True, max_length=100, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(fields=['region', 'is_capital'], name='location_region_capital_idx'),
+        ),
+        migrations.RunPython(build_region_rollups, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,27 @@
-from django.db import models
+from functools import reduce
+from operator import add
+
+from django.db import models, router, transaction
+from django.db.models import F
 from main_app.choices import RoomTypeChoice
 from main_app.choices import ClassTypeChoice
+from main_app.managers import CharacterManager, TruncateManager
+from main_app.managers import LocationQuerySet, RegionRollupManager, ROLLUP_FIELDS_ORDER
+
+
+# Weights of the stored power score. Changing them needs a new migration,
+# the database then recomputes the column for every row.
+POWER_SCORE_WEIGHTS = (
+    ('level', 10),
+    ('strength', 3),
+    ('dexterity', 2),
+    ('intelligence', 2),
+    ('hit_points', 1),
+)
+
+
+def power_score_expression():
+    return reduce(add, (F(field) * weight for field, weight in POWER_SCORE_WEIGHTS))
 
 
 class Pet(models.Model):
@@ -15,6 +36,8 @@ class Artifact(models.Model):
     description  = models.TextField()
     is_magical = models.BooleanField(default=False)
 
+    objects = TruncateManager()
+
 
 class Location(models.Model):
     name = models.CharField(max_length=100)
@@ -23,6 +46,53 @@ class Location(models.Model):
     description = models.TextField()
     is_capital = models.BooleanField(default=False)
 
+    objects = LocationQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['region', 'is_capital'], name='location_region_capital_idx'),
+        ]
+
+    def rollup_state(self):
+        return tuple(getattr(self, field) for field in ROLLUP_FIELDS_ORDER)
+
+    def _stored_rollup_state(self, using):
+        # The rollup fields as the RegionRollup totals currently count them,
+        # locked until the write commits. The instance may predate an update().
+        if self.pk is None:
+            return None
+
+        return type(self)._base_manager.using(using).select_for_update().filter(pk=self.pk).values_list(
+            *ROLLUP_FIELDS_ORDER
+        ).first()
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+
+        with transaction.atomic(using=using):
+            previous = self._stored_rollup_state(using)
+            super().save(*args, **kwargs)
+            RegionRollup.objects.db_manager(self._state.db).location_changed(previous, self.rollup_state())
+
+    def delete(self, *args, **kwargs):
+        using = kwargs.get('using') or self._state.db
+
+        with transaction.atomic(using=using):
+            previous = self._stored_rollup_state(using)
+            result = super().delete(*args, **kwargs)
+            RegionRollup.objects.db_manager(using).location_changed(previous, None)
+
+        return result
+
+
+class RegionRollup(models.Model):
+    region = models.CharField(max_length=50, unique=True)
+    total_population = models.PositiveBigIntegerField(default=0)
+    location_count = models.PositiveIntegerField(default=0)
+    capital = models.CharField(max_length=100, null=True, blank=True)
+
+    objects = RegionRollupManager()
+
 
 class Car(models.Model):
     model = models.CharField(max_length=40)
@@ -57,3 +127,15 @@ class Character(models.Model):
     intelligence = models.PositiveIntegerField()
     hit_points = models.PositiveIntegerField()
     inventory = models.TextField()
+    power_score = models.GeneratedField(
+        expression=power_score_expression(),
+        output_field=models.BigIntegerField(),
+        db_persist=True,
+    )
+
+    objects = CharacterManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['class_name', '-power_score', 'id'], name='character_class_power_idx'),
+        ]
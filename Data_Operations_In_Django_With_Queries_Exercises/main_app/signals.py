@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+
+# Sent once per truncate() after the transaction commits,
+# with sender=<model>, using=<db alias> and cascade=<bool>.
+post_truncate = Signal()
@@ -0,0 +1,61 @@
+from django.db.models import F
+from django.test import TestCase
+
+from main_app.models import Location, RegionRollup
+
+
+def location(name, region, population, is_capital=False):
+    return Location(name=name, region=region, population=population, description='', is_capital=is_capital)
+
+
+class RegionRollupTests(TestCase):
+    def assertRollupsMatchLocations(self):
+        expected = {}
+
+        for name, region, population, is_capital in Location.objects.order_by('id').values_list(
+            'name', 'region', 'population', 'is_capital'
+        ):
+            total, count, capital = expected.get(region, (0, 0, None))
+            expected[region] = (total + population, count + 1, capital or (name if is_capital else None))
+
+        self.assertEqual(
+            {
+                rollup.region: (rollup.total_population, rollup.location_count, rollup.capital)
+                for rollup in RegionRollup.objects.dashboard()
+            },
+            expected,
+        )
+
+    def test_save_of_a_stale_instance_uses_the_stored_row(self):
+        stored = Location.objects.create(name='Sofia', region='West', population=100, description='')
+        stale = Location.objects.get(pk=stored.pk)
+        Location.objects.filter(pk=stored.pk).update(population=300, region='East')
+
+        stale.population = 150
+        stale.save()
+
+        self.assertEqual(RegionRollup.objects.for_region('West').total_population, 150)
+        self.assertEqual(RegionRollup.objects.for_region('West').location_count, 1)
+        self.assertRollupsMatchLocations()
+
+    def test_bulk_create_update_and_delete_keep_the_rollups_in_step(self):
+        Location.objects.bulk_create([
+            location('Sofia', 'West', 100, is_capital=True),
+            location('Pernik', 'West', 50),
+            location('Varna', 'East', 80),
+            location('Burgas', 'East', 70, is_capital=True),
+            location('Ruse', 'North', 40),
+        ])
+        self.assertRollupsMatchLocations()
+
+        Location.objects.filter(region='East').update(population=F('population') + 5)
+        self.assertRollupsMatchLocations()
+
+        Location.objects.filter(name='Ruse').update(region='East', is_capital=True)
+        self.assertRollupsMatchLocations()
+
+        Location.objects.filter(name__in=['Sofia', 'Burgas']).delete()
+        self.assertRollupsMatchLocations()
+
+        Location.objects.get(name='Pernik').delete()
+        self.assertRollupsMatchLocations()
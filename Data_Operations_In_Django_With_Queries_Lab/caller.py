@@ -46,10 +46,7 @@ def get_students_info():
     return '\n'.join(f"Student №{s.student_id}: {s.first_name} {s.last_name}; Email: {s.email}" for s in studs)
 
 def update_students_emails():
-    all_studs = Student.objects.all()
-    for s in all_studs:
-        s.email = s.email.replace(s.email.split('@')[1], 'uni-students.com')
-        s.save()
+    Student.objects.change_email_domain('uni-students.com')
 
 def truncate_students():
-    Student.objects.all().delete()
\ No newline at end of file
+    Student.objects.truncate()
\ No newline at end of file
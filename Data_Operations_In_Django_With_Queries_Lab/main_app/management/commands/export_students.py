@@ -0,0 +1,25 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+
+from main_app.models import Student
+
+
+class Command(BaseCommand):
+    help = 'Streams all students into a CSV file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+
+        with open(options['path'], 'w', newline='', encoding='utf-8') as file:
+            written = Student.objects.export_csv(file, batch_size=options['batch_size'])
+
+        elapsed = perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {written} students in {elapsed:.2f}s "
+            f"({written / elapsed if elapsed else 0:.0f} rows/s)."
+        ))
@@ -0,0 +1,35 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from main_app.managers import ON_CONFLICT_CHOICES
+from main_app.models import Student
+
+
+class Command(BaseCommand):
+    help = 'Streams students from a CSV file into the database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--on-conflict', choices=ON_CONFLICT_CHOICES, default='skip')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+
+        try:
+            with open(options['path'], newline='', encoding='utf-8') as file:
+                read, written = Student.objects.import_csv(
+                    file,
+                    on_conflict=options['on_conflict'],
+                    batch_size=options['batch_size'],
+                )
+        except (IntegrityError, ValueError) as e:
+            raise CommandError(str(e))
+
+        elapsed = perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Read {read} rows, wrote {written} students ({read - written} skipped) in {elapsed:.2f}s "
+            f"({read / elapsed if elapsed else 0:.0f} rows/s)."
+        ))
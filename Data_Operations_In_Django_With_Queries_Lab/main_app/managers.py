@@ -0,0 +1,251 @@
+import csv
+from itertools import islice
+
+from django.core.management.color import no_style
+from django.db import connections, models, router, transaction
+from django.db.models import Count, Exists, OuterRef, Value
+from django.db.models.functions import Concat, StrIndex, Substr
+
+from main_app.signals import post_truncate
+
+
+class TruncateManager(models.Manager):
+    def truncate(self, allow_cascade: bool = False) -> None:
+        referencing_models = sorted({
+            f.related_model._meta.label
+            for f in self.model._meta.get_fields(include_hidden=True)
+            if f.auto_created and not f.concrete and (f.one_to_many or f.one_to_one)
+        })
+
+        if referencing_models and not allow_cascade:
+            raise ValueError(
+                f"Cannot truncate {self.model._meta.label}, it is referenced by "
+                f"{', '.join(referencing_models)}. Pass allow_cascade=True to clear them too."
+            )
+
+        using = router.db_for_write(self.model)
+        connection = connections[using]
+        tables = [self.model._meta.db_table]
+
+        with transaction.atomic(using=using):
+            # TRUNCATE ... RESTART IDENTITY on PostgreSQL, DELETE plus a
+            # sqlite_sequence reset on SQLite; no per-row collector either way.
+            sql_list = connection.ops.sql_flush(
+                no_style(), tables, reset_sequences=True, allow_cascade=allow_cascade
+            )
+            connection.ops.execute_sql_flush(sql_list)
+
+            transaction.on_commit(
+                lambda: post_truncate.send(sender=self.model, using=using, cascade=allow_cascade),
+                using=using,
+            )
+
+
+STUDENT_CSV_COLUMNS = ('student_id', 'first_name', 'last_name', 'birth_date', 'email')
+ON_CONFLICT_CHOICES = ('skip', 'update', 'error')
+
+
+def email_with_domain(domain: str):
+    # Keeps everything up to and including the '@' (substr/instr on SQLite,
+    # SUBSTRING/STRPOS on PostgreSQL), so the local part is never touched.
+    return Concat(
+        Substr('email', 1, StrIndex('email', Value('@'))),
+        Value(domain),
+        output_field=models.EmailField(),
+    )
+
+
+class StudentManager(TruncateManager):
+    def _email_domain_targets(self, new_domain: str, old_domain: str = None):
+        # Addresses without an '@' have no domain to replace; rewriting them
+        # would leave just the new domain.
+        targets = self.filter(email__contains='@').exclude(email__iendswith=f'@{new_domain}')
+
+        if old_domain is not None:
+            targets = targets.filter(email__iendswith=f'@{old_domain}')
+
+        return targets
+
+
+    def email_domain_collisions(self, new_domain: str, old_domain: str = None) -> list[str]:
+        targets = self._email_domain_targets(new_domain, old_domain).annotate(
+            new_email=email_with_domain(new_domain)
+        )
+
+        # Two rewritten students ending up with the same address...
+        duplicated = targets.values('new_email').annotate(
+            students=Count('pk')
+        ).filter(students__gt=1).values_list('new_email', flat=True)
+
+        # ...or a rewritten address that another student already has.
+        taken = targets.filter(
+            Exists(self.filter(email=OuterRef('new_email')))
+        ).values_list('new_email', flat=True)
+
+        return sorted({*duplicated, *taken})
+
+
+    def change_email_domain(self, new_domain: str, old_domain: str = None, chunk_size: int = None) -> int:
+        collisions = self.email_domain_collisions(new_domain, old_domain)
+
+        if collisions:
+            raise ValueError(
+                f"Changing the email domain to {new_domain} would duplicate {len(collisions)} "
+                f"addresses, e.g. {', '.join(collisions[:5])}"
+            )
+
+        targets = self._email_domain_targets(new_domain, old_domain)
+
+        if chunk_size is None:
+            return targets.update(email=email_with_domain(new_domain))
+
+        updated = 0
+        last_pk = None
+
+        while True:
+            chunk = targets if last_pk is None else targets.filter(pk__gt=last_pk)
+            bound = chunk.order_by('pk').values_list('pk', flat=True)[chunk_size - 1:chunk_size].first()
+            chunk = chunk if bound is None else chunk.filter(pk__lte=bound)
+
+            with transaction.atomic(using=self.db):
+                updated += chunk.update(email=email_with_domain(new_domain))
+
+            if bound is None:
+                return updated
+
+            last_pk = bound
+
+
+    def import_csv(self, file, on_conflict: str = 'skip', batch_size: int = 5000) -> tuple[int, int]:
+        if on_conflict not in ON_CONFLICT_CHOICES:
+            raise ValueError(f"on_conflict must be one of {', '.join(ON_CONFLICT_CHOICES)}")
+
+        columns = next(csv.reader([file.readline()]), [])
+
+        if set(columns) != set(STUDENT_CSV_COLUMNS):
+            raise ValueError(f"CSV header must contain exactly: {', '.join(STUDENT_CSV_COLUMNS)}")
+
+        using = router.db_for_write(self.model)
+
+        if connections[using].vendor == 'postgresql':
+            return self._copy_from(file, columns, on_conflict, using)
+
+        return self._bulk_import(csv.reader(file), columns, on_conflict, batch_size, using)
+
+
+    def _copy_from(self, file, columns, on_conflict, using) -> tuple[int, int]:
+        table = connections[using].ops.quote_name(self.model._meta.db_table)
+        column_list = ', '.join(STUDENT_CSV_COLUMNS)
+        conflict_clause = {
+            'skip': 'ON CONFLICT DO NOTHING',
+            'update': 'ON CONFLICT (student_id) DO UPDATE SET '
+                      + ', '.join(f"{c} = EXCLUDED.{c}" for c in STUDENT_CSV_COLUMNS if c != 'student_id'),
+            'error': '',
+        }[on_conflict]
+
+        staged = f"SELECT DISTINCT ON (student_id) {column_list} FROM student_import ORDER BY student_id"
+
+        if on_conflict == 'update':
+            # ON CONFLICT (student_id) cannot resolve an email taken by another
+            # student, so those rows are left out: one row per email in the
+            # file, and none whose email already belongs to someone else.
+            staged = (
+                f"SELECT DISTINCT ON (email) {column_list} FROM ({staged}) AS staged "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {table} AS existing "
+                f"WHERE existing.email = staged.email AND existing.student_id <> staged.student_id) "
+                f"ORDER BY email, student_id"
+            )
+
+        with transaction.atomic(using=using), connections[using].cursor() as cursor:
+            # COPY streams the file into an unconstrained staging table, the
+            # conflicts are then resolved by a single INSERT ... SELECT.
+            cursor.execute(
+                f"CREATE TEMP TABLE student_import (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            cursor.copy_expert(f"COPY student_import ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", file)
+            read = cursor.rowcount
+            cursor.execute(f"INSERT INTO {table} ({column_list}) {staged} {conflict_clause}")
+            written = cursor.rowcount
+
+        return read, written
+
+
+    def _bulk_import(self, rows, columns, on_conflict, batch_size, using) -> tuple[int, int]:
+        conflict_options = {
+            'skip': {'ignore_conflicts': True},
+            'update': {
+                'update_conflicts': True,
+                'unique_fields': ['student_id'],
+                'update_fields': [c for c in STUDENT_CSV_COLUMNS if c != 'student_id'],
+            },
+            'error': {},
+        }[on_conflict]
+        connection = connections[using]
+        read = written = 0
+
+        with transaction.atomic(using=using):
+            connection.ensure_connection()
+            changes_before = getattr(connection.connection, 'total_changes', None)
+
+            while batch := list(islice(rows, batch_size)):
+                students = [self.model(**{c: v or None for c, v in zip(columns, row)}) for row in batch]
+
+                if on_conflict == 'update':
+                    students = self._without_email_conflicts(students, using)
+
+                self.db_manager(using).bulk_create(students, **conflict_options)
+                read += len(batch)
+
+            if changes_before is None:
+                written = read
+            else:
+                written = connection.connection.total_changes - changes_before
+
+        return read, written
+
+
+    def _without_email_conflicts(self, students, using) -> list:
+        # Upserts only resolve student_id conflicts, so rows whose email is
+        # already used by another student, in the table or earlier in the
+        # batch, are skipped instead of failing the whole import.
+        owners = dict(
+            self.db_manager(using).filter(email__in={student.email for student in students})
+            .values_list('email', 'student_id')
+        )
+        kept = []
+
+        for student in students:
+            owner = owners.setdefault(student.email, student.student_id)
+
+            if owner == student.student_id:
+                kept.append(student)
+
+        return kept
+
+
+    def export_csv(self, file, batch_size: int = 5000) -> int:
+        using = router.db_for_read(self.model)
+        connection = connections[using]
+
+        if connection.vendor == 'postgresql':
+            table = connection.ops.quote_name(self.model._meta.db_table)
+
+            with connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY (SELECT {', '.join(STUDENT_CSV_COLUMNS)} FROM {table} ORDER BY student_id) "
+                    f"TO STDOUT WITH (FORMAT csv, HEADER)",
+                    file,
+                )
+                return cursor.rowcount
+
+        writer = csv.writer(file)
+        writer.writerow(STUDENT_CSV_COLUMNS)
+        written = 0
+
+        for row in self.using(using).order_by('student_id').values_list(*STUDENT_CSV_COLUMNS).iterator(
+            chunk_size=batch_size
+        ):
+            writer.writerow(['' if value is None else value for value in row])
+            written += 1
+
+        return written
@@ -1,8 +1,11 @@
 import datetime
 import os
 import django
-from datetime import timedelta
+from itertools import groupby
+from operator import itemgetter
+from typing import List, Tuple
 
+from django.db import connections
 from django.db.models import QuerySet
 
 # Set up Django
@@ -10,34 +13,43 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
 django.setup()
 
 # Import your models here
-from main_app.models import Author, Book
+from main_app.aggregates import GroupConcat, supports_ordered_group_concat
+from main_app.managers import SongLinkResult
+from main_app.song_cache import get_artist_songs, song_cache_stats
+from main_app.models import Author
 from main_app.models import Song, Artist
 from main_app.models import Product, Review
 from main_app.models import Driver, DrivingLicense
-from main_app.models import Owner, Car, Registration
+from main_app.models import Owner, Car
 
 # Create queries within functions
-def show_all_authors_with_their_books():
-    authors = Author.objects.all().order_by("id")
-    authors_with_books = []
+def iter_authors_with_their_books():
+    # One query either way; iterator() streams the rows instead of caching them.
+    if supports_ordered_group_concat(connections[Author.objects.db]):
+        authors = Author.objects.filter(book__isnull=False).annotate(
+            titles=GroupConcat('book__title', order_by='book__id')
+        ).order_by("id").values_list('name', 'titles')
+
+        for name, titles in authors.iterator():
+            yield f"{name} has written - {titles}!"
 
-    for author in authors:
-        books = Book.objects.filter(author=author)
+        return
 
-        if not books:
-            continue
+    # Without an ordered string aggregate, one row per book is grouped here.
+    rows = Author.objects.filter(book__isnull=False).order_by("id", "book__id").values_list(
+        'id', 'name', 'book__title'
+    )
 
-        titles = ', '.join(b.title for b in books)
+    for (_, name), books in groupby(rows.iterator(), key=itemgetter(0, 1)):
+        yield f"{name} has written - {', '.join(title for _, _, title in books)}!"
 
-        authors_with_books.append(
-            f"{author.name} has written - {titles}!"
-        )
 
-    return '\n'.join(authors_with_books)
+def show_all_authors_with_their_books():
+    return '\n'.join(iter_authors_with_their_books())
 
 
 def delete_all_authors_without_books():
-    Author.objects.filter(book__isnull=True).delete()
+    Author.objects.delete_orphans('book')
 
 
 def add_song_to_artist(artist_name: str, song_title: str):
@@ -50,7 +62,11 @@ def add_song_to_artist(artist_name: str, song_title: str):
 def get_songs_by_artist(artist_name: str):
     artist = Artist.objects.get(name=artist_name)
 
-    return artist.songs.all().order_by("-id")
+    return get_artist_songs(artist)
+
+
+def get_songs_cache_stats() -> dict:
+    return dict(song_cache_stats)
 
 
 def remove_song_from_artist(artist_name: str, song_title: str):
@@ -60,13 +76,16 @@ def remove_song_from_artist(artist_name: str, song_title: str):
     artist.songs.remove(song)
 
 
-def calculate_average_rating_for_product_by_name(product_name: str):
-    given_product = Product.objects.get(name=product_name)
-    reviews = given_product.reviews.all()
+def add_songs_to_artists(pairs: List[Tuple[str, str]]) -> SongLinkResult:
+    return Artist.objects.link_songs(pairs)
+
+
+def remove_songs_from_artists(pairs: List[Tuple[str, str]]) -> SongLinkResult:
+    return Artist.objects.unlink_songs(pairs)
 
-    avg_rating = sum(r.rating for r in reviews) / len(reviews)
 
-    return avg_rating
+def calculate_average_rating_for_product_by_name(product_name: str):
+    return Product.objects.get(name=product_name).average_rating
 
 
 def get_reviews_with_high_ratings(threshold: int):
@@ -74,50 +93,41 @@ def get_reviews_with_high_ratings(threshold: int):
 
 
 def get_products_with_no_reviews():
-    return Product.objects.filter(reviews__isnull=True).order_by("-name")
+    return Product.objects.filter(review_count=0).order_by("-name")
 
 
 def delete_products_without_reviews():
-    Product.objects.filter(reviews__isnull=True).delete()
-
-
-def calculate_licenses_expiration_dates():
-    licenses = DrivingLicense.objects.all().order_by('-license_number')
-
-    license_expiration_dates = []
+    Product.objects.delete_orphans('reviews')
 
-    for license in licenses:
-        expiration_date = license.issue_date + timedelta(days=365)
 
-        expiration_str = f"License with number: {license.license_number} expires on {expiration_date}!"
+def iter_licenses_expiration_dates():
+    # (license_number, expires_on) tuples straight from the generated column.
+    return DrivingLicense.objects.order_by('-license_number').values_list(
+        'license_number', 'expires_on'
+    ).iterator()
 
-        license_expiration_dates.append(expiration_str)
 
-    return '\n'.join(license_expiration_dates)
+def calculate_licenses_expiration_dates():
+    return '\n'.join(
+        f"License with number: {license_number} expires on {expires_on}!"
+        for license_number, expires_on in iter_licenses_expiration_dates()
+    )
 
 
 def get_drivers_with_expired_licenses(due_date: datetime.date) -> QuerySet[Driver]:
-    latest_possible_issue_date = due_date - timedelta(365)
-    drivers_with_expired_license = Driver.objects.filter(
-        license__issue_date__lt=latest_possible_issue_date
-    )
-
-    return drivers_with_expired_license
+    return Driver.objects.filter(license__expires_on__lt=due_date)
 
 
 def register_car_by_owner(owner: Owner) -> str:
-    car = Car.objects.filter(registration__isnull=True).first()
-    registration = Registration.objects.filter(car__isnull=True).first()
-
-    car.owner = owner
-    car.registration = registration
-
-    car.save()
-
-    registration.registration_date = datetime.date.today()
-    registration.car = car
-
-    registration.save()
+    [(owner, car, registration)] = Car.objects.register_for_owners([owner])
 
     return (f"Successfully registered {car.model}"
             f" to {owner.name} with registration number {registration.registration_number}.")
+
+
+def register_cars_by_owners(owners: List[Owner]) -> List[str]:
+    return [
+        f"Successfully registered {car.model}"
+        f" to {owner.name} with registration number {registration.registration_number}."
+        for owner, car, registration in Car.objects.register_for_owners(owners)
+    ]
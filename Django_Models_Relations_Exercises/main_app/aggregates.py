@@ -0,0 +1,43 @@
+from django.db import NotSupportedError, models
+
+
+def supports_ordered_group_concat(connection) -> bool:
+    # SQLite accepts ORDER BY inside an aggregate call from 3.44 on.
+    return connection.vendor == 'postgresql' or (
+        connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= (3, 44, 0)
+    )
+
+
+class GroupConcat(models.Aggregate):
+    # STRING_AGG(expression, delimiter ORDER BY order_by) on PostgreSQL,
+    # GROUP_CONCAT(expression, delimiter ORDER BY order_by) on SQLite 3.44+.
+    output_field = models.TextField()
+
+    def __init__(self, expression, order_by, delimiter: str = ', ', **extra):
+        super().__init__(expression, models.Value(delimiter), order_by, **extra)
+
+    def _compile_parts(self, compiler):
+        sql, params = [], []
+
+        for expression in self.get_source_expressions():
+            expression_sql, expression_params = compiler.compile(expression)
+            sql.append(expression_sql)
+            params.extend(expression_params)
+
+        return sql, tuple(params)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(f"GroupConcat cannot order its values on {connection.display_name}.")
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        if not supports_ordered_group_concat(connection):
+            return self.as_sql(compiler, connection, **extra_context)
+
+        (expression_sql, delimiter_sql, order_by_sql), params = self._compile_parts(compiler)
+
+        return f"GROUP_CONCAT({expression_sql}, {delimiter_sql} ORDER BY {order_by_sql})", params
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        (expression_sql, delimiter_sql, order_by_sql), params = self._compile_parts(compiler)
+
+        return f"STRING_AGG({expression_sql}, {delimiter_sql} ORDER BY {order_by_sql})", params
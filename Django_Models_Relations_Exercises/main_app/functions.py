@@ -0,0 +1,19 @@
+from django.db import models
+
+
+class AddDays(models.Func):
+    # issue_date + 365 on PostgreSQL (date + integer is a date and is immutable,
+    # unlike date + interval), date(issue_date, '+365 days') on SQLite.
+    # Both are deterministic, so the function can back a generated column.
+    output_field = models.DateField()
+
+    def __init__(self, expression, days: int, **extra):
+        super().__init__(expression, days=int(days), **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, template='(%(expressions)s + %(days)s)', **extra_context)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, template="date(%(expressions)s, '%(days)+d days')", **extra_context
+        )
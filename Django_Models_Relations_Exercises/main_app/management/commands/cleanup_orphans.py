@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from main_app.models import Author, Product
+
+
+ORPHAN_TARGETS = {
+    'authors': (Author, 'book'),
+    'products': (Product, 'reviews'),
+}
+
+
+class Command(BaseCommand):
+    help = 'Deletes authors without books or products without reviews in primary-key bounded chunks.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', choices=ORPHAN_TARGETS)
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        model, related_name = ORPHAN_TARGETS[options['target']]
+        verb = 'Found' if options['dry_run'] else 'Deleted'
+
+        total = model.objects.delete_orphans(
+            related_name,
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+            progress=lambda processed: self.stdout.write(f"{verb} {processed} so far..."),
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"{verb} {total} orphaned {options['target']}."))
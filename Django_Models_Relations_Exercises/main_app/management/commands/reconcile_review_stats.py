@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from main_app.models import Product
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds Product.review_count and Product.rating_sum from the reviews with a single GROUP BY.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        reconciled = Product.objects.reconcile_review_stats(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Reconciled review stats for {reconciled} reviewed products."))
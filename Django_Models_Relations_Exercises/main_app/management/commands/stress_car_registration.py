@@ -0,0 +1,80 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from main_app.models import Car, Owner, Registration
+
+
+class Command(BaseCommand):
+    help = 'Registers cars from many concurrent workers and checks that no car or registration is claimed twice.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=16)
+        parser.add_argument('--owners-per-call', type=int, default=5)
+        parser.add_argument('--calls', type=int, default=200)
+
+    def handle(self, *args, **options):
+        if not connection.features.has_select_for_update_skip_locked:
+            raise CommandError(f"{connection.vendor} does not support SELECT ... FOR UPDATE SKIP LOCKED.")
+
+        per_call = options['owners_per_call']
+        total = per_call * options['calls']
+
+        with transaction.atomic():
+            owners = Owner.objects.bulk_create(Owner(name=f"Stress Owner {i}") for i in range(total))
+            cars = Car.objects.bulk_create(Car(model=f"Stress Car {i}", year=2025) for i in range(total))
+            registrations = Registration.objects.bulk_create(
+                Registration(registration_number=f"ST{i:08d}") for i in range(total)
+            )
+
+        # Only the fixture rows may be claimed, so cars and registrations that
+        # existed before the run are never handed to stress owners.
+        car_pool = Car.objects.filter(pk__in=[car.pk for car in cars])
+        registration_pool = Registration.objects.filter(pk__in=[registration.pk for registration in registrations])
+
+        def register(batch):
+            try:
+                return [
+                    (car.pk, registration.pk)
+                    for _, car, registration in Car.objects.register_for_owners(
+                        batch, car_pool=car_pool, registration_pool=registration_pool
+                    )
+                ]
+            finally:
+                connection.close()
+
+        try:
+            batches = [owners[i:i + per_call] for i in range(0, total, per_call)]
+            start = perf_counter()
+
+            with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+                claimed = [pair for pairs in executor.map(register, batches) for pair in pairs]
+
+            elapsed = perf_counter() - start
+            claimed_cars = Counter(car_pk for car_pk, _ in claimed)
+            claimed_registrations = Counter(registration_pk for _, registration_pk in claimed)
+            double_booked = sum(1 for times in claimed_cars.values() if times > 1) + sum(
+                1 for times in claimed_registrations.values() if times > 1
+            )
+            # Every fixture car must end up with one stress owner and one fixture registration.
+            mismatched = car_pool.exclude(
+                owner__in=owners,
+                registration__in=registration_pool,
+            ).count()
+        finally:
+            Registration.objects.filter(pk__in=[registration.pk for registration in registrations]).delete()
+            Car.objects.filter(pk__in=[car.pk for car in cars]).delete()
+            Owner.objects.filter(pk__in=[owner.pk for owner in owners]).delete()
+
+        if len(claimed) != total or double_booked or mismatched:
+            raise CommandError(
+                f"Registered {len(claimed)}/{total} owners, {double_booked} cars or registrations were claimed "
+                f"more than once, {mismatched} cars are not paired with a stress owner and registration."
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Registered {len(claimed)} owners from {options['workers']} workers in {elapsed:.2f}s, no double bookings."
+        ))
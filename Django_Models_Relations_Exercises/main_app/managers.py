@@ -0,0 +1,309 @@
+import datetime
+from dataclasses import dataclass, field
+from functools import reduce
+from operator import or_
+
+from django.db import models, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum
+
+from main_app.song_cache import invalidate_artist_songs
+
+
+class OrphanCleanupManager(models.Manager):
+    def orphans(self, related_name: str):
+        # NOT EXISTS (SELECT 1 FROM related WHERE related.fk = pk) instead of
+        # the LEFT JOIN ... IS NULL that filter(<related>__isnull=True) builds.
+        relation = self.model._meta.get_field(related_name)
+        related = relation.related_model._base_manager.filter(**{relation.field.name: OuterRef('pk')})
+
+        return self.filter(~Exists(related))
+
+
+    def delete_orphans(self, related_name: str, chunk_size: int = 1000, dry_run: bool = False, progress=None) -> int:
+        orphans = self.orphans(related_name)
+        processed = 0
+        last_pk = None
+
+        while True:
+            chunk = orphans if last_pk is None else orphans.filter(pk__gt=last_pk)
+            bound = chunk.order_by('pk').values_list('pk', flat=True)[chunk_size - 1:chunk_size].first()
+
+            if bound is not None:
+                chunk = chunk.filter(pk__lte=bound)
+
+            if dry_run:
+                done = chunk.count()
+            else:
+                with transaction.atomic(using=self.db):
+                    done = chunk.delete()[1].get(self.model._meta.label, 0)
+
+            processed += done
+
+            if progress is not None and done:
+                progress(processed)
+
+            if bound is None:
+                return processed
+
+            last_pk = bound
+
+
+class ProductManager(OrphanCleanupManager):
+    def apply_review_delta(self, product_id: int, count: int = 0, rating: int = 0) -> None:
+        if count or rating:
+            self.filter(pk=product_id).update(
+                review_count=F('review_count') + count,
+                rating_sum=F('rating_sum') + rating,
+            )
+
+
+    def review_changed(self, previous, current) -> None:
+        # previous/current are Review.review_state() tuples,
+        # None for a review that did not exist before / no longer exists.
+        if previous == current:
+            return
+
+        if previous is not None and current is not None and previous[0] == current[0]:
+            self.apply_review_delta(current[0], rating=current[1] - previous[1])
+            return
+
+        if previous is not None:
+            self.apply_review_delta(previous[0], -1, -previous[1])
+
+        if current is not None:
+            self.apply_review_delta(current[0], 1, current[1])
+
+
+    def refresh_review_stats(self, product_ids) -> None:
+        product_ids = set(product_ids)
+        stats = {
+            row['product']: row
+            for row in self._reviews().filter(product__in=product_ids).values('product').annotate(
+                count=Count('id'),
+                total=Sum('rating'),
+            ).order_by()
+        }
+        products = []
+
+        for product in self.filter(pk__in=product_ids).only('pk'):
+            row = stats.get(product.pk, {})
+            product.review_count = row.get('count', 0)
+            product.rating_sum = row.get('total') or 0
+            products.append(product)
+
+        self.bulk_update(products, ['review_count', 'rating_sum'])
+
+
+    def reconcile_review_stats(self, batch_size: int = 1000) -> int:
+        stats = self._reviews().values('product').annotate(
+            count=Count('id'),
+            total=Sum('rating'),
+        ).order_by().values_list('product', 'count', 'total')
+        reconciled = 0
+
+        with transaction.atomic(using=self.db):
+            self.update(review_count=0, rating_sum=0)
+            batch = []
+
+            for product_id, count, total in stats.iterator(chunk_size=batch_size):
+                batch.append(self.model(pk=product_id, review_count=count, rating_sum=total))
+
+                if len(batch) == batch_size:
+                    self.bulk_update(batch, ['review_count', 'rating_sum'])
+                    reconciled += len(batch)
+                    batch = []
+
+            self.bulk_update(batch, ['review_count', 'rating_sum'])
+            reconciled += len(batch)
+
+        return reconciled
+
+
+    def _reviews(self):
+        return self.model._meta.apps.get_model('main_app', 'Review')._base_manager.using(self._db)
+
+
+class ReviewQuerySet(models.QuerySet):
+    def _products(self):
+        return self.model._meta.apps.get_model('main_app', 'Product').objects.db_manager(self.db)
+
+
+    def update(self, **kwargs):
+        if 'rating' not in kwargs and 'product' not in kwargs and 'product_id' not in kwargs:
+            return super().update(**kwargs)
+
+        with transaction.atomic(using=self.db):
+            product_ids = set(self.values_list('product', flat=True).distinct())
+            new_product = kwargs.get('product_id', kwargs.get('product'))
+
+            if new_product is not None:
+                product_ids.add(getattr(new_product, 'pk', new_product))
+
+            rows = super().update(**kwargs)
+            self._products().refresh_review_stats(product_ids)
+
+        return rows
+
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            removed = list(self.values('product').annotate(
+                count=Count('id'),
+                total=Sum('rating'),
+            ).order_by().values_list('product', 'count', 'total'))
+            result = super().delete()
+
+            for product_id, count, total in removed:
+                self._products().apply_review_delta(product_id, -count, -total)
+
+        return result
+
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            added = {}
+
+            for obj in objs:
+                count, total = added.get(obj.product_id, (0, 0))
+                added[obj.product_id] = (count + 1, total + obj.rating)
+
+            if kwargs.get('ignore_conflicts') or kwargs.get('update_conflicts'):
+                self._products().refresh_review_stats(added)
+            else:
+                for product_id, (count, total) in added.items():
+                    self._products().apply_review_delta(product_id, count, total)
+
+        return objs
+
+
+class CarManager(models.Manager):
+    def register_for_owners(
+            self,
+            owners,
+            registration_date: datetime.date = None,
+            car_pool: models.QuerySet = None,
+            registration_pool: models.QuerySet = None,
+    ):
+        # car_pool and registration_pool narrow the rows that may be claimed;
+        # by default any free car and registration is.
+        owners = list(owners)
+        registration_date = registration_date or datetime.date.today()
+        Registration = self.model._meta.apps.get_model('main_app', 'Registration')
+
+        if car_pool is None:
+            car_pool = self.all()
+
+        if registration_pool is None:
+            registration_pool = Registration._default_manager.db_manager(self.db).all()
+
+        with transaction.atomic(using=self.db):
+            # SKIP LOCKED lets concurrent callers claim disjoint rows instead of
+            # queueing on (or double-booking) the first free car and registration.
+            cars = list(
+                car_pool.select_for_update(skip_locked=True, of=('self',))
+                .filter(registration__isnull=True)
+                .order_by('id')[:len(owners)]
+            )
+            registrations = list(
+                registration_pool.select_for_update(skip_locked=True)
+                .filter(car__isnull=True)
+                .order_by('id')[:len(owners)]
+            )
+
+            if len(cars) < len(owners) or len(registrations) < len(owners):
+                raise ValueError(
+                    f"Cannot register {len(owners)} cars, only {min(len(cars), len(registrations))} "
+                    f"free car/registration pairs are available"
+                )
+
+            for owner, car, registration in zip(owners, cars, registrations):
+                car.owner = owner
+                registration.car = car
+                registration.registration_date = registration_date
+
+            self.bulk_update(cars, ['owner'])
+            Registration._default_manager.db_manager(self.db).bulk_update(
+                registrations, ['car', 'registration_date']
+            )
+
+        return list(zip(owners, cars, registrations))
+
+
+@dataclass
+class SongLinkResult:
+    # Links written (existing ones included) by link_songs(), rows deleted by unlink_songs().
+    links: int = 0
+    unknown_artists: set = field(default_factory=set)
+    unknown_songs: set = field(default_factory=set)
+
+
+class ArtistManager(models.Manager):
+    # Artists per DELETE, keeps the OR-ed WHERE clause within SQLite's expression depth limit.
+    UNLINK_ARTISTS_PER_STATEMENT = 500
+
+    def _resolve_song_links(self, pairs):
+        pairs = set(pairs)
+        Song = self.model.songs.rel.model
+        artist_names = {artist_name for artist_name, _ in pairs}
+        song_titles = {song_title for _, song_title in pairs}
+
+        # Artist names are not unique, a name links every artist carrying it.
+        artist_ids = {}
+        for artist_id, name in self.filter(name__in=artist_names).values_list('id', 'name'):
+            artist_ids.setdefault(name, []).append(artist_id)
+
+        song_ids = dict(Song._default_manager.db_manager(self.db).filter(
+            title__in=song_titles
+        ).values_list('title', 'id'))
+
+        result = SongLinkResult(
+            unknown_artists=artist_names - artist_ids.keys(),
+            unknown_songs=song_titles - song_ids.keys(),
+        )
+        links = {
+            (artist_id, song_ids[song_title])
+            for artist_name, song_title in pairs
+            if artist_name in artist_ids and song_title in song_ids
+            for artist_id in artist_ids[artist_name]
+        }
+
+        return links, result
+
+
+    def link_songs(self, pairs) -> SongLinkResult:
+        links, result = self._resolve_song_links(pairs)
+        through = self.model.songs.through
+
+        result.links = len(through._default_manager.db_manager(self.db).bulk_create(
+            [through(artist_id=artist_id, song_id=song_id) for artist_id, song_id in links],
+            ignore_conflicts=True,
+        ))
+        # bulk_create() on the through table does not send m2m_changed.
+        invalidate_artist_songs({artist_id for artist_id, _ in links}, self.db)
+
+        return result
+
+
+    def unlink_songs(self, pairs) -> SongLinkResult:
+        links, result = self._resolve_song_links(pairs)
+        through = self.model.songs.through
+        songs_by_artist = {}
+
+        for artist_id, song_id in links:
+            songs_by_artist.setdefault(artist_id, []).append(song_id)
+
+        artist_ids = list(songs_by_artist)
+
+        with transaction.atomic(using=self.db):
+            for i in range(0, len(artist_ids), self.UNLINK_ARTISTS_PER_STATEMENT):
+                condition = reduce(or_, (
+                    Q(artist_id=artist_id, song_id__in=songs_by_artist[artist_id])
+                    for artist_id in artist_ids[i:i + self.UNLINK_ARTISTS_PER_STATEMENT]
+                ))
+                deleted, _ = through._default_manager.db_manager(self.db).filter(condition).delete()
+                result.links += deleted
+
+        invalidate_artist_songs(artist_ids, self.db)
+
+        return result
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:21
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_review_stats(apps, schema_editor):
+    Product = apps.get_model('main_app', 'Product')
+    Review = apps.get_model('main_app', 'Review')
+
+    stats = Review.objects.values('product').annotate(
+        count=Count('id'),
+        total=Sum('rating'),
+    ).order_by().values_list('product', 'count', 'total')
+
+    Product.objects.bulk_update(
+        [Product(pk=product_id, review_count=count, rating_sum=total) for product_id, count, total in stats],
+        ['review_count', 'rating_sum'],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0005_owner_car_registration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='rating_sum',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['review_count'], name='product_review_count_idx'),
+        ),
+        migrations.RunPython(backfill_review_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:22
+
+import main_app.functions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0006_product_review_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='drivinglicense',
+            name='expires_on',
+            field=models.GeneratedField(db_persist=True, expression=main_app.functions.AddDays('issue_date', 365), output_field=models.DateField()),
+        ),
+        migrations.AddIndex(
+            model_name='drivinglicense',
+            index=models.Index(fields=['expires_on'], name='license_expires_on_idx'),
+        ),
+    ]
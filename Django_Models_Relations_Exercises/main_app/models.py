@@ -1,9 +1,14 @@
-from django.db import models
+from django.db import models, router, transaction
+
+from main_app.functions import AddDays
+from main_app.managers import ArtistManager, CarManager, OrphanCleanupManager, ProductManager, ReviewQuerySet
 
 # Create your models here.
 class Author(models.Model):
     name = models.CharField(max_length=40)
 
+    objects = OrphanCleanupManager()
+
 
 class Book(models.Model):
     title = models.CharField(max_length=40)
@@ -19,9 +24,27 @@ class Artist(models.Model):
     name = models.CharField(max_length=100)
     songs = models.ManyToManyField(Song, related_name="artists")
 
+    objects = ArtistManager()
+
 
 class Product(models.Model):
     name = models.CharField(max_length=100, unique=True)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveBigIntegerField(default=0)
+
+    objects = ProductManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['review_count'], name='product_review_count_idx'),
+        ]
+
+    @property
+    def average_rating(self):
+        if not self.review_count:
+            return None
+
+        return self.rating_sum / self.review_count
 
 
 class Review(models.Model):
@@ -33,6 +56,39 @@ class Review(models.Model):
         related_name="reviews"
     )
 
+    objects = ReviewQuerySet.as_manager()
+
+    def review_state(self):
+        return self.product_id, self.rating
+
+    def _stored_review_state(self, using):
+        # The product and rating the Product counters hold for this review,
+        # locked for the write; self may be older than the row.
+        if self.pk is None:
+            return None
+
+        return type(self)._base_manager.using(using).select_for_update().filter(pk=self.pk).values_list(
+            'product_id', 'rating'
+        ).first()
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+
+        with transaction.atomic(using=using):
+            previous = self._stored_review_state(using)
+            super().save(*args, **kwargs)
+            Product.objects.db_manager(self._state.db).review_changed(previous, self.review_state())
+
+    def delete(self, *args, **kwargs):
+        using = kwargs.get('using') or self._state.db
+
+        with transaction.atomic(using=using):
+            previous = self._stored_review_state(using)
+            result = super().delete(*args, **kwargs)
+            Product.objects.db_manager(using).review_changed(previous, None)
+
+        return result
+
 
 class Driver(models.Model):
     first_name = models.CharField(max_length=50)
@@ -40,14 +96,26 @@ class Driver(models.Model):
 
 
 class DrivingLicense(models.Model):
+    VALIDITY_DAYS = 365
+
     license_number = models.CharField(max_length=10, unique=True)
     issue_date = models.DateField()
+    expires_on = models.GeneratedField(
+        expression=AddDays('issue_date', VALIDITY_DAYS),
+        output_field=models.DateField(),
+        db_persist=True,
+    )
     driver = models.OneToOneField(
         Driver,
         on_delete=models.CASCADE,
         related_name="license"
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['expires_on'], name='license_expires_on_idx'),
+        ]
+
 
 class Owner(models.Model):
     name = models.CharField(max_length=50)
@@ -64,6 +132,8 @@ class Car(models.Model):
         related_name="cars"
     )
 
+    objects = CarManager()
+
 
 class Registration(models.Model):
     registration_number = models.CharField(max_length=10, unique=True)
@@ -0,0 +1,29 @@
+from django.db.models.signals import m2m_changed, post_delete, pre_delete
+from django.dispatch import receiver
+
+from main_app.models import Artist, Song
+from main_app.song_cache import invalidate_artist_songs
+
+
+@receiver(m2m_changed, sender=Artist.songs.through)
+def artist_songs_changed(sender, instance, action, reverse, pk_set, using, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_artist_songs([instance.pk], using)
+    elif action == 'pre_clear':
+        # The artists of a song are gone after the clear, remember them first.
+        instance._cleared_artist_ids = list(instance.artists.values_list('id', flat=True))
+    elif action == 'post_clear':
+        invalidate_artist_songs(getattr(instance, '_cleared_artist_ids', []), using)
+    elif action in ('post_add', 'post_remove'):
+        invalidate_artist_songs(pk_set, using)
+
+
+@receiver(pre_delete, sender=Song)
+def song_deleted(sender, instance, using, **kwargs):
+    invalidate_artist_songs(instance.artists.values_list('id', flat=True), using)
+
+
+@receiver(post_delete, sender=Artist)
+def artist_deleted(sender, instance, using, **kwargs):
+    invalidate_artist_songs([instance.pk], using)
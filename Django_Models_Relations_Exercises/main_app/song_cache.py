@@ -0,0 +1,40 @@
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+# Per-process hit/miss counters of the songs-by-artist cache.
+song_cache_stats = Counter(hits=0, misses=0)
+# Bounds how long an entry cached from not yet committed (or rolled back)
+# data can outlive the invalidation that missed it.
+SONG_CACHE_TIMEOUT = 300
+
+
+def artist_songs_key(artist_id: int) -> str:
+    return f'main_app:artist-songs:{artist_id}'
+
+
+def get_artist_songs(artist):
+    key = artist_songs_key(artist.pk)
+    song_ids = cache.get(key)
+
+    if song_ids is None:
+        song_cache_stats['misses'] += 1
+        song_ids = list(artist.songs.order_by('-id').values_list('id', flat=True))
+        cache.set(key, song_ids, timeout=SONG_CACHE_TIMEOUT)
+    else:
+        song_cache_stats['hits'] += 1
+
+    songs = artist.songs.model.objects.in_bulk(song_ids)
+
+    return [songs[song_id] for song_id in song_ids if song_id in songs]
+
+
+def invalidate_artist_songs(artist_ids, using: str = None) -> None:
+    # Runs once the change is committed, so a concurrent read cannot cache the
+    # old list again between the invalidation and the commit.
+    keys = [artist_songs_key(artist_id) for artist_id in artist_ids]
+
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys), using=using)
@@ -1,3 +1,105 @@
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from caller import show_all_authors_with_their_books
+from main_app.models import Artist, Author, Book, Product, Review, Song
+from main_app.song_cache import get_artist_songs
+
+
+class ShowAllAuthorsWithTheirBooksTests(TestCase):
+    def test_lists_every_author_in_one_query(self):
+        for name, titles in [('Ivan', ['B', 'A', 'C']), ('Maria', ['Z']), ('Petar', ['Y', 'X'])]:
+            author = Author.objects.create(name=name)
+
+            for title in titles:
+                Book.objects.create(title=title, price=10, author=author)
+
+        Author.objects.create(name='No Books')
+
+        with self.assertNumQueries(1):
+            result = show_all_authors_with_their_books()
+
+        self.assertEqual(result, '\n'.join([
+            'Ivan has written - B, A, C!',
+            'Maria has written - Z!',
+            'Petar has written - Y, X!',
+        ]))
+
+
+class ArtistSongsCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_invalidates_only_after_commit(self):
+        artist = Artist.objects.create(name='Artist')
+        first = Song.objects.create(title='First')
+        artist.songs.add(first)
+        self.assertEqual(get_artist_songs(artist), [first])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second = Song.objects.create(title='Second')
+            artist.songs.add(second)
+            # Still inside the transaction: the committed list stays cached.
+            self.assertEqual(get_artist_songs(artist), [first])
+
+        self.assertEqual(get_artist_songs(artist), [second, first])
+
+
+class ProductReviewStatsTests(TestCase):
+    def assertStats(self, product, review_count, rating_sum):
+        product.refresh_from_db()
+        self.assertEqual((product.review_count, product.rating_sum), (review_count, rating_sum))
+
+    def test_counters_follow_every_kind_of_review_write(self):
+        first = Product.objects.create(name='First')
+        second = Product.objects.create(name='Second')
+        self.assertIsNone(first.average_rating)
+
+        review = Review.objects.create(description='Good', rating=4, product=first)
+        self.assertStats(first, 1, 4)
+
+        review.rating = 2
+        review.save()
+        self.assertStats(first, 1, 2)
+
+        review.product = second
+        review.save()
+        self.assertStats(first, 0, 0)
+        self.assertStats(second, 1, 2)
+        self.assertIsNone(first.average_rating)
+
+        Review.objects.bulk_create([
+            Review(description='Fine', rating=3, product=first),
+            Review(description='Great', rating=5, product=first),
+            Review(description='Bad', rating=1, product=second),
+        ])
+        self.assertStats(first, 2, 8)
+        self.assertStats(second, 2, 3)
+        self.assertEqual(first.average_rating, 4)
+
+        Review.objects.filter(product=first).update(rating=5)
+        self.assertStats(first, 2, 10)
+
+        Review.objects.filter(rating=1).update(product=first)
+        self.assertStats(first, 3, 11)
+        self.assertStats(second, 1, 2)
+
+        Review.objects.filter(product=first).delete()
+        self.assertStats(first, 0, 0)
+        self.assertIsNone(first.average_rating)
+
+        review.delete()
+        self.assertStats(second, 0, 0)
+
+    def test_save_of_a_stale_instance_uses_the_stored_row(self):
+        first = Product.objects.create(name='First')
+        second = Product.objects.create(name='Second')
+        review = Review.objects.create(description='Good', rating=4, product=first)
+        stale = Review.objects.get(pk=review.pk)
+        Review.objects.filter(pk=review.pk).update(product=second, rating=5)
+
+        stale.rating = 3
+        stale.save()
+
+        self.assertStats(first, 1, 3)
+        self.assertStats(second, 0, 0)
@@ -0,0 +1,79 @@
+import datetime
+import random
+from itertools import islice
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from main_app.models import Lecturer, Student, StudentEnrollment, Subject
+
+
+class Command(BaseCommand):
+    help = 'Seeds enrollments and times each report-card query over them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--enrollments', type=int, default=1_000_000)
+        parser.add_argument('--subjects-per-student', type=int, default=20)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded rows instead of deleting them.')
+
+    def handle(self, *args, **options):
+        per_student = options['subjects_per_student']
+        students_count = max(1, options['enrollments'] // per_student)
+
+        start = perf_counter()
+        lecturers, subjects, students = self.seed(students_count, per_student, options['batch_size'])
+        self.stdout.write(f"Seeded {students_count * per_student} enrollments in {perf_counter() - start:.1f}s.")
+
+        try:
+            for name in ('student_gpas', 'subject_distribution', 'lecturer_pass_rates'):
+                queryset = getattr(StudentEnrollment.objects, name)()
+                start = perf_counter()
+                rows = sum(1 for _ in queryset.iterator(chunk_size=options['batch_size']))
+                elapsed = perf_counter() - start
+
+                self.stdout.write(f"{name}: {rows} rows in {elapsed * 1000:.0f} ms\n{queryset.explain()}")
+        finally:
+            if not options['keep']:
+                Student.objects.filter(pk__in=students).delete()
+                Subject.objects.filter(pk__in=subjects).delete()
+                Lecturer.objects.filter(pk__in=lecturers).delete()
+
+    def seed(self, students_count, per_student, batch_size):
+        grades = list(StudentEnrollment.GRADE_POINTS)
+
+        with transaction.atomic():
+            lecturers = Lecturer.objects.bulk_create(
+                Lecturer(first_name='Bench', last_name=f'Lecturer {i}') for i in range(50)
+            )
+            subjects = Subject.objects.bulk_create(
+                Subject(name=f'Bench Subject {i}', code=f'BS{i:04d}', lecturer=lecturers[i % len(lecturers)])
+                for i in range(max(per_student, 200))
+            )
+            students = [
+                student.pk for student in Student.objects.bulk_create(
+                    (
+                        Student(
+                            student_id=f'BM{i:08d}',
+                            first_name='Bench',
+                            last_name=f'Student {i}',
+                            birth_date=datetime.date(2000, 1, 1),
+                            email=f'bench.student.{i}@example.com',
+                        )
+                        for i in range(students_count)
+                    ),
+                    batch_size=batch_size,
+                )
+            ]
+
+            enrollments = (
+                StudentEnrollment(student_id=student_id, subject=subject, grade=random.choice(grades))
+                for student_id in students
+                for subject in random.sample(subjects, per_student)
+            )
+
+            while batch := list(islice(enrollments, batch_size)):
+                StudentEnrollment.objects.bulk_create(batch)
+
+        return [l.pk for l in lecturers], [s.pk for s in subjects], students
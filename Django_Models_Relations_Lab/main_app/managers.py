@@ -0,0 +1,49 @@
+from django.db import models
+from django.db.models import Avg, Case, Count, F, Q, Value, When
+
+
+class StudentEnrollmentManager(models.Manager):
+    def grade_points(self):
+        return Case(
+            *(When(grade=grade, then=Value(points)) for grade, points in self.model.GRADE_POINTS.items()),
+            output_field=models.FloatField(),
+        )
+
+
+    def _grade_breakdown(self):
+        return {
+            'enrollments': Count('id'),
+            'average_points': Avg(self.grade_points()),
+            'passed': Count('id', filter=~Q(grade__in=self.model.FAILING_GRADES)),
+            **{
+                f'grade_{grade.lower()}': Count('id', filter=Q(grade=grade))
+                for grade in self.model.GRADE_POINTS
+            },
+        }
+
+
+    def student_gpas(self):
+        return self.values(
+            'student',
+            first_name=F('student__first_name'),
+            last_name=F('student__last_name'),
+        ).annotate(
+            subjects=Count('id'),
+            gpa=Avg(self.grade_points()),
+        ).order_by('student')
+
+
+    def subject_distribution(self):
+        return self.values(
+            'subject',
+            name=F('subject__name'),
+            code=F('subject__code'),
+        ).annotate(**self._grade_breakdown()).order_by('subject')
+
+
+    def lecturer_pass_rates(self):
+        return self.filter(subject__lecturer__isnull=False).values(
+            lecturer=F('subject__lecturer'),
+            first_name=F('subject__lecturer__first_name'),
+            last_name=F('subject__lecturer__last_name'),
+        ).annotate(**self._grade_breakdown()).order_by('lecturer')
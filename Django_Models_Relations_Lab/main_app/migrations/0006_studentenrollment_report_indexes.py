@@ -0,0 +1,21 @@
+# Generated by Django 5.0.4 on 2026-10-19 11:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0005_lecturerprofile'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentenrollment',
+            index=models.Index(fields=['student', 'subject'], name='enrollment_student_subject_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentenrollment',
+            index=models.Index(fields=['subject', 'grade'], name='enrollment_subject_grade_idx'),
+        ),
+    ]
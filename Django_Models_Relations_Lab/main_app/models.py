@@ -1,5 +1,7 @@
 from django.db import models
 
+from main_app.managers import StudentEnrollmentManager
+
 # Create your models here.
 class Lecturer(models.Model):
     first_name = models.CharField(max_length=100)
@@ -35,11 +37,29 @@ class StudentEnrollment(models.Model):
         E = 'E', 'E'
         F = 'F', 'F'
 
+    GRADE_POINTS = {
+        StudentsGrades.A: 5,
+        StudentsGrades.B: 4,
+        StudentsGrades.C: 3,
+        StudentsGrades.D: 2,
+        StudentsGrades.E: 1,
+        StudentsGrades.F: 0,
+    }
+    FAILING_GRADES = [StudentsGrades.F]
+
     student = models.ForeignKey(Student, on_delete=models.CASCADE)
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE)
     enrollment_date = models.DateField(auto_now_add=True)
     grade =models.CharField(max_length=1, choices=StudentsGrades.choices)
 
+    objects = StudentEnrollmentManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['student', 'subject'], name='enrollment_student_subject_idx'),
+            models.Index(fields=['subject', 'grade'], name='enrollment_subject_grade_idx'),
+        ]
+
 
 class LecturerProfile(models.Model):
     lecturer = models.OneToOneField(Lecturer, on_delete=models.CASCADE)